@@ -1,101 +1,147 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 import logging
+import time
 from quarto.mcts.search import MCTS
-from quarto.mcts.select import Select
-from quarto.mcts.stoppers import MaxTime
-from quarto.mcts.simulate import BatchSimulator, Simulator
-from quarto.mcts.expand import Expand
-from quarto.mcts.measures import UCT
-from quarto.mcts.node import Node
-from quarto.mtdf.mtdf import iterative_deepening, lookup
-from quarto.representation.constants import ATTRIBUTES
-from quarto.representation.logic import PIECE, State, get_payoffs, get_winner, is_over, get_ply, state_to_string, play
+from quarto.mcts.select import ProgressiveSelect, Select, SolverSelect
+from quarto.mcts.stoppers import Confident, MaxTime
+from quarto.mcts.simulate import BatchSimulator, HeavySimulator, RaveSimulator, Simulator
+from quarto.mcts.expand import Expand, ProgressiveExpand, Widening
+from quarto.mcts.hybrid import ExactSimulator
+from quarto.mcts.measures import RAVE, UCT, ZeroSumUCT
+from quarto.mcts.node import (Node, back_propagate, get_best_move, get_value, rave_propagate, solve_propagate,
+                              zero_sum_propagate)
+from quarto.mcts.telemetry import Telemetry
+from quarto.mtdf.evaluate import Evaluator
+from quarto.mtdf.mtdf import MTDFSolver
+from quarto.representation.logic import State, get_path, get_payoff, is_over, get_ply, play
 from quarto.representation.move import Move
 from quarto.representation.player import Player, get_plying
-from quarto.mcts.cumdict import cumdict
+from quarto.representation.symmetry import get_unique_moves
+from quarto.arena.tournament import run_tournament
+from quarto.play.clock import TimeManager
+from quarto.play.handle import SearchHandle, search_mcts, search_mtdf
 
 
 @dataclass
 class MCTSPlayer:
     
-    def __init__(self, max_time: float = 2., expand_k: int = 1, n_sims: int = 1, exploration: float = 1.) -> None:
-        stop = MaxTime(max_time)
-        select = Select(UCT(exploration))
-        expand = Expand(expand_k)
-        simulate = BatchSimulator(n_sims) if n_sims > 1 else Simulator()
-        self.solver = MCTS(stop, select, expand, simulate)
-        self.root = None
+    def __init__(self, max_time: float = 2., expand_k: int = 1, n_sims: int = 1, exploration: float = 1.,
+                 solver: bool = False, exact_threshold: int = 0, widening: float = 0., rave: bool = False,
+                 symmetric: bool = False, telemetry: bool = False, ponder: bool = False, clock: float = 0.,
+                 confident: bool = False, zero_sum: bool = False, lean: bool = False,
+                 max_nodes: int = 0, batch_size: int = 1, heavy: bool = False) -> None:
+        if solver and widening > 0:
+            raise ValueError("solver and widening cannot be combined")
+        if rave and (solver or exact_threshold > 0 or heavy or n_sims > 1):
+            raise ValueError("rave cannot be combined with solver, exact_threshold, heavy or n_sims")
+        if zero_sum and (solver or rave or exact_threshold > 0 or n_sims > 1):
+            raise ValueError("zero_sum cannot be combined with solver, rave, exact_threshold or n_sims")
+        stop = Confident(MaxTime(max_time)) if confident else MaxTime(max_time)
+        measure = RAVE(exploration) if rave else ZeroSumUCT(exploration) if zero_sum else UCT(exploration)
+        select = SolverSelect(measure) if solver else Select(measure)
+        expand = Expand(expand_k, get_unique_moves) if symmetric else Expand(expand_k)
+        if widening > 0:
+            select = ProgressiveSelect(measure, Widening(widening))
+            expand = ProgressiveExpand(Widening(widening))
+        simulate = HeavySimulator() if heavy else RaveSimulator() if rave else Simulator()
+        if zero_sum:
+            simulate.get_payoffs = get_payoff  # type: ignore
+        if n_sims > 1:
+            simulate = BatchSimulator(n_sims, simulate)
+        if exact_threshold > 0:
+            simulate = ExactSimulator(exact_threshold, simulate)
+        propagate = (solve_propagate if solver else rave_propagate if rave else
+                     zero_sum_propagate if zero_sum else back_propagate)
+        self.solver = MCTS(stop, select, expand, simulate, back_propagate=propagate, zero_sum=zero_sum)  # type: ignore
+        self.solver.lean = lean
+        self.solver.max_nodes = max_nodes
+        self.solver.batch_size = batch_size
+        if telemetry:
+            self.solver.telemetry = Telemetry()
+        self.ponder = ponder
+        self.confident = confident
+        self.clock = TimeManager(clock) if clock > 0 else None
+        self.root: Node | None = None
+        self.pondering: SearchHandle | None = None
 
-    def goto(self, state: State) -> Node:
-        assert self.root is not None
-        node = self.root
-        for move in state.keys():
-            node = node.children[move]
+    def resume(self, state: State) -> Node | None:
+        if self.pondering is not None:
+            self.pondering.stop()
+            self.pondering = None
+        node, self.root = self.root, None
+        if node is None or (path := get_path(node.state, state)) is None:
+            return None
+        for move in path:
+            if (node := node.children.get(move)) is None:
+                return None
+        if node.proven is not None and not node.children:
+            return None
+        node.parent = None
         return node
 
     def __call__(self, state: State) -> Move:
-        # if self.root is None:
-        #     node = self.root = get_root(state)
-        # else:
-        #     node = self.goto(state)
-        # self.solver.search(state, node)
-        node = self.solver.search(state)
-        values = {}
-        for move, child in node.children.items():
-            values[move] = child.payoffs[node.plying] / child.visits
-        best_move = max(values, key=values.get)
-        ev = node.payoffs[Player.PLAYER1] / node.visits
-        logging.info(f"MCTS {node.visits=:,}\t{ev=:+.3f}\t{best_move=}")
+        start = time.perf_counter()
+        if self.clock is not None:
+            stop = MaxTime(self.clock.allocate(state))
+            self.solver.stop = Confident(stop) if self.confident else stop
+        node = self.solver.search(state, self.resume(state))
+        best_move = get_best_move(node)
+        if self.clock is not None:
+            self.clock.spend(time.perf_counter() - start)
+        ev = get_value(node, Player.PLAYER1)
+        logging.info(f"MCTS {node.visits=:,}\t{ev=:+.3f}\t{best_move=}\t{node.proven=}")
+        if self.solver.telemetry is not None:
+            logging.info(f"MCTS {self.solver.telemetry!s}")
+        if self.ponder:
+            self.root = child = node.children[best_move]
+            if child.state is None:
+                child.state = play(state, best_move)
+            if child.plying != node.plying and not child.game_over:
+                solver = replace(self.solver, stop=MaxTime(float('inf')), telemetry=None)
+                self.pondering = search_mcts(solver, child.state, child)
         return best_move
     
 
 @dataclass
 class MTDFPlayer:
     max_time: float = 2.
+    solver: MTDFSolver = field(default_factory=MTDFSolver)
+    ponder: bool = False
+    clock: float = 0.
+    evaluate: bool = False
+    pondering: SearchHandle | None = field(default=None, init=False)
+    timer: TimeManager | None = field(default=None, init=False)
+
+    def __post_init__(self):
+        if self.clock > 0:
+            self.timer = TimeManager(self.clock)
+        if self.evaluate:
+            self.solver.evaluate = Evaluator()
 
     def __call__(self, state: State) -> Move:
-        iterative_deepening(state, 32, max_time=self.max_time)
-        entry = lookup(state)
+        start = time.perf_counter()
+        if self.pondering is not None:
+            self.pondering.stop()
+            self.pondering = None
+        max_time = self.max_time if self.timer is None else self.timer.allocate(state)
+        self.solver.iterative_deepening(state, 32, max_time)
+        entry = self.solver.lookup(state)
+        if self.timer is not None:
+            self.timer.spend(time.perf_counter() - start)
         logging.info(f"MTDF {entry=}")
         assert entry.best_move is not None
+        if self.ponder:
+            child = play(state, entry.best_move)
+            if get_plying(get_ply(child)) != get_plying(get_ply(state)) and not is_over(child):
+                self.pondering = search_mtdf(self.solver, child)
         return entry.best_move
     
 
-def main(n_games: int = 20):
+def main(n_games: int = 20, path: str | None = "tournament.jsonl", max_workers: int | None = None):
     logging.root.level = logging.INFO
-    mcts = MCTSPlayer()
-    mtdf = MTDFPlayer()
-    players = {Player.PLAYER1: mtdf, Player.PLAYER2: mcts}
-    cum_payoffs = cumdict(int)
-    solvers_wins = cumdict(int)
-    players_wins = cumdict(int)
-    for game in range(n_games):
-        print(f"{game=}")
-        state = State()
-        print(state_to_string(state))
-        while not is_over(state):
-            plying = get_plying(get_ply(state))
-            player = players[plying]
-            move = player(state)
-            state = play(state, move)
-            print(state_to_string(state))
-        payoffs = get_payoffs(state)
-        winner = get_winner(state)
-        players_wins[winner] = 1
-        if players[Player.PLAYER1] is mcts:
-            payoffs = {'mcts': payoffs[Player.PLAYER1], 'mtdf': payoffs[Player.PLAYER2]}
-            winner = 'mcts' if winner == Player.PLAYER1 else ('mtdf' if winner == Player.PLAYER2 else None)
-        else:
-            payoffs = {'mtdf': payoffs[Player.PLAYER1], 'mcts': payoffs[Player.PLAYER2]}
-            winner = 'mtdf' if winner == Player.PLAYER1 else ('mcts' if winner == Player.PLAYER2 else None)
-        cum_payoffs.update(payoffs)
-        solvers_wins[winner] = 1
-        print(f"{payoffs=}")
-        print(f"{cum_payoffs=}")
-        print(f"{solvers_wins=}")
-        players = {Player.PLAYER1: players[Player.PLAYER2],
-                   Player.PLAYER2: players[Player.PLAYER1]}
-    print(f"{cum_payoffs=}")
+    factories = {'mtdf': MTDFPlayer, 'mcts': MCTSPlayer}
+    summary = run_tournament(factories, n_games, path, max_workers)
+    print(f"{summary!s}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,92 @@
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
+import json
+import logging
+import math
+import os
+
+from quarto.arena.tournament import PlayerFactory, Record, Summary, init_worker, run_game, schedule
+
+
+def get_score(elo: float) -> float:
+    return 1 / (1 + 10**(-elo / 400))
+
+
+def get_elo(score: float) -> float:
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def get_elo_interval(summary: Summary, z: float = 1.96) -> tuple[float, float]:
+    low, high = summary.interval(z)
+    return get_elo(low), get_elo(high)
+
+
+@dataclass(slots=True, frozen=True)
+class SPRT:
+    elo0: float = 0.
+    elo1: float = 10.
+    alpha: float = .05
+    beta: float = .05
+    min_games: int = 32
+    pseudo_games: int = 1
+
+    @property
+    def bounds(self) -> tuple[float, float]:
+        return math.log(self.beta / (1 - self.alpha)), math.log((1 - self.beta) / self.alpha)
+
+    def llr(self, summary: Summary) -> float:
+        if summary.games == 0:
+            return 0.
+        summary = replace(summary, wins=summary.wins + self.pseudo_games, losses=summary.losses + self.pseudo_games)
+        n, score, variance = summary.games, summary.score, summary.variance
+        if variance == 0:
+            return 0.
+        score0, score1 = get_score(self.elo0), get_score(self.elo1)
+        return n * (score1 - score0) * (2 * score - score0 - score1) / (2 * variance)
+
+    def __call__(self, summary: Summary) -> bool | None:
+        if summary.games < self.min_games:
+            return None
+        lower, upper = self.bounds
+        llr = self.llr(summary)
+        if llr >= upper:
+            return True
+        if llr <= lower:
+            return False
+        return None
+
+
+def run_sprt(factories: Mapping[str, PlayerFactory], sprt: SPRT = SPRT(), max_games: int = 10_000,
+             path: str | None = None, max_workers: int | None = None) -> tuple[Summary, bool | None]:
+    names = tuple(factories)
+    assert len(names) == 2
+    summary = Summary(*names)
+    games = schedule(names, max_games)  # type: ignore
+    verdict = None
+    max_workers = max_workers or os.cpu_count() or 1
+    with (open(path, 'a') if path is not None else nullcontext()) as output, \
+         ProcessPoolExecutor(max_workers, initializer=init_worker, initargs=(factories,)) as pool:
+        pending = set[Future[Record]]()
+        for game in games:
+            pending.add(pool.submit(run_game, *game))
+            if len(pending) >= 2 * max_workers:
+                break
+        while pending and verdict is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                summary.update(record)
+                if output is not None:
+                    output.write(json.dumps(record) + '\n')
+                    output.flush()
+                if (game := next(games, None)) is not None:
+                    pending.add(pool.submit(run_game, *game))
+            verdict = sprt(summary)
+            low, high = get_elo_interval(summary)
+            logging.info(f"{summary!s}\tllr={sprt.llr(summary):+.3f}\t"
+                         f"elo={get_elo(summary.score):+.1f} [{low:+.1f}, {high:+.1f}]")
+        pool.shutdown(cancel_futures=True)
+    return summary, verdict
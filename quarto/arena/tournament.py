@@ -0,0 +1,125 @@
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass
+import json
+import logging
+import math
+import random
+import time
+
+from quarto.representation.logic import State, get_ply, get_winner, is_over, play
+from quarto.representation.move import Move
+from quarto.representation.player import Player, get_plying
+
+
+PlayerF = Callable[[State], Move]
+PlayerFactory = Callable[[], PlayerF]
+Record = dict
+
+
+PLAYERS: dict[str, PlayerF] = {}
+
+
+@dataclass(slots=True)
+class Summary:
+    name: str
+    opponent: str
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        if self.games == 0:
+            return .5
+        return (self.wins + self.draws / 2) / self.games
+
+    @property
+    def variance(self) -> float:
+        if (n := self.games) == 0:
+            return 0.
+        score = self.score
+        return (self.wins * (1 - score)**2 + self.draws * (.5 - score)**2 + self.losses * score**2) / n
+
+    def interval(self, z: float = 1.96) -> tuple[float, float]:
+        score, n = self.score, self.games
+        if n == 0:
+            return 0., 1.
+        shrink = 1 + z * z / n
+        center = (score + z * z / (2 * n)) / shrink
+        margin = z * math.sqrt(score * (1 - score) / n + z * z / (4 * n * n)) / shrink
+        return max(0., center - margin), min(1., center + margin)
+
+    def update(self, record: Record):
+        if record["winner"] is None:
+            self.draws += 1
+        elif record["winner"] == self.name:
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    def __str__(self) -> str:
+        low, high = self.interval()
+        return (f"{self.name} vs {self.opponent}: +{self.wins} ={self.draws} -{self.losses}\t"
+                f"score={self.score:.3f} [{low:.3f}, {high:.3f}]")
+
+
+def init_worker(factories: Mapping[str, PlayerFactory]):
+    random.seed()
+    PLAYERS.clear()
+    PLAYERS.update({name: factory() for name, factory in factories.items()})
+
+
+def play_game(players: Mapping[Player, PlayerF]) -> tuple[State, list[Move]]:
+    state, moves = State(), []
+    while not is_over(state):
+        move = players[get_plying(get_ply(state))](state)
+        state = play(state, move)
+        moves.append(move)
+    return state, moves
+
+
+def run_game(game: int, first: str, second: str) -> Record:
+    start = time.perf_counter()
+    names = {Player.PLAYER1: first, Player.PLAYER2: second}
+    state, moves = play_game({player: PLAYERS[name] for player, name in names.items()})
+    winner = get_winner(state)
+    return {
+        "game": game,
+        "first": first,
+        "second": second,
+        "winner": None if winner is None else names[winner],
+        "plies": len(moves),
+        "moves": moves,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def schedule(names: tuple[str, str], n_games: int) -> Iterable[tuple[int, str, str]]:
+    for game in range(n_games):
+        first, second = names if game % 2 == 0 else names[::-1]
+        yield game, first, second
+
+
+def run_tournament(factories: Mapping[str, PlayerFactory], n_games: int, path: str | None = None,
+                   max_workers: int | None = None) -> Summary:
+    names = tuple(factories)
+    assert len(names) == 2
+    summary = Summary(*names)
+    with (open(path, 'a') if path is not None else nullcontext()) as output, \
+         ProcessPoolExecutor(max_workers, initializer=init_worker, initargs=(factories,)) as pool:
+        futures = [pool.submit(run_game, *game) for game in schedule(names, n_games)]  # type: ignore
+        for future in as_completed(futures):
+            record = future.result()
+            summary.update(record)
+            if output is not None:
+                output.write(json.dumps(record) + '\n')
+                output.flush()
+            logging.info(f"{record['game']=}\t{record['winner']=}\t{record['plies']=}\t{record['elapsed']=:.1f}")
+            logging.info(f"{summary!s}")
+    return summary
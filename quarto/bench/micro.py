@@ -0,0 +1,182 @@
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+import argparse
+import json
+import logging
+import platform
+import random
+import sys
+import time
+
+from quarto.mtdf.mtdf import MTDFSolver
+from quarto.representation import logic
+from quarto.representation.logic import State
+from quarto.representation.move import Move
+from quarto.representation import symmetry
+
+
+@dataclass(slots=True, frozen=True)
+class Backend:
+    name: str
+    new: Callable[[], State]
+    play: Callable[[State, Move], State]
+    get_moves: Callable[[State], Sequence[Move]]
+    get_winner: Callable[[State], object]
+    is_over: Callable[[State], bool]
+
+
+BACKENDS = {
+    'dict': Backend('dict', State, logic.play, logic.get_moves, logic.get_winner, logic.is_over),
+}
+
+
+@dataclass(slots=True)
+class Result:
+    name: str
+    backend: str
+    ops: int
+    seconds: float
+
+    @property
+    def ops_per_sec(self) -> float:
+        return self.ops / self.seconds
+
+    def to_dict(self) -> dict:
+        return asdict(self) | {"ops_per_sec": self.ops_per_sec}
+
+
+def get_corpus(backend: Backend, n_states: int, seed: int) -> list[State]:
+    rng = random.Random(seed)
+    states = []
+    while len(states) < n_states:
+        state = backend.new()
+        while not backend.is_over(state):
+            states.append(state)
+            state = backend.play(state, rng.choice(backend.get_moves(state)))
+        states.append(state)
+    return states[:n_states]
+
+
+def timed(f: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_play(backend: Backend, states: list[State], rng: random.Random, repeat: int) -> Result:
+    pairs = [(state, rng.choice(backend.get_moves(state))) for state in states if not backend.is_over(state)]
+    play = backend.play
+    seconds = timed(lambda: [play(state, move) for state, move in pairs], repeat)
+    return Result("play", backend.name, len(pairs), seconds)
+
+
+def bench_get_moves(backend: Backend, states: list[State], rng: random.Random, repeat: int) -> Result:
+    get_moves = backend.get_moves
+    seconds = timed(lambda: [get_moves(state) for state in states], repeat)
+    return Result("get_moves", backend.name, len(states), seconds)
+
+
+def bench_get_winner(backend: Backend, states: list[State], rng: random.Random, repeat: int) -> Result:
+    get_winner = backend.get_winner
+    seconds = timed(lambda: [get_winner(state) for state in states], repeat)
+    return Result("get_winner", backend.name, len(states), seconds)
+
+
+def bench_is_over(backend: Backend, states: list[State], rng: random.Random, repeat: int) -> Result:
+    is_over = backend.is_over
+    seconds = timed(lambda: [is_over(state) for state in states], repeat)
+    return Result("is_over", backend.name, len(states), seconds)
+
+
+def bench_playout(backend: Backend, states: list[State], rng: random.Random, repeat: int) -> Result:
+    n_playouts = max(1, len(states) // 16)
+
+    def playouts():
+        for _ in range(n_playouts):
+            state = backend.new()
+            while not backend.is_over(state):
+                state = backend.play(state, rng.choice(backend.get_moves(state)))
+
+    return Result("playout", backend.name, n_playouts, timed(playouts, repeat))
+
+
+def bench_canonical(backend: Backend, states: list[State], rng: random.Random, repeat: int) -> Result:
+    get_canonical = symmetry.get_canonical
+
+    def canonicalize():
+        symmetry._get_canonical.cache_clear()
+        for state in states:
+            get_canonical(state)
+
+    return Result("canonical", backend.name, len(states), timed(canonicalize, repeat))
+
+
+def bench_lookup(backend: Backend, states: list[State], rng: random.Random, repeat: int) -> Result:
+    lookup = MTDFSolver().lookup
+    for state in states:
+        lookup(state)
+    seconds = timed(lambda: [lookup(state) for state in states], repeat)
+    return Result("lookup", backend.name, len(states), seconds)
+
+
+BenchF = Callable[[Backend, list[State], random.Random, int], Result]
+BENCHMARKS: dict[str, BenchF] = {
+    "play": bench_play,
+    "get_moves": bench_get_moves,
+    "get_winner": bench_get_winner,
+    "is_over": bench_is_over,
+    "playout": bench_playout,
+    "canonical": bench_canonical,
+    "lookup": bench_lookup,
+}
+
+
+def run(backends: Sequence[str], benchmarks: Sequence[str], n_states: int = 10_000, repeat: int = 5,
+        seed: int = 0) -> list[Result]:
+    results = []
+    for name in backends:
+        backend = BACKENDS[name]
+        states = get_corpus(backend, n_states, seed)
+        for benchmark in benchmarks:
+            result = BENCHMARKS[benchmark](backend, states, random.Random(seed), repeat)
+            logging.info(f"{result.backend}\t{result.name:<12}{result.ops_per_sec:>14,.0f} ops/s")
+            results.append(result)
+    return results
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m quarto.bench.micro")
+    parser.add_argument("--backend", action="append", choices=sorted(BACKENDS),
+                        help="backend to measure (repeatable, default: all)")
+    parser.add_argument("--bench", action="append", choices=list(BENCHMARKS),
+                        help="benchmark to run (repeatable, default: all)")
+    parser.add_argument("--states", type=int, default=10_000, help="number of corpus states")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions, the best one is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="-", help="JSON report path ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    results = run(args.backend or sorted(BACKENDS), args.bench or list(BENCHMARKS), args.states, args.repeat, args.seed)
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "states": args.states,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": [result.to_dict() for result in results],
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from functools import reduce
+
+from quarto.representation.logic import State, play
+from quarto.representation.move import Move
+
+
+@dataclass(slots=True, frozen=True)
+class Position:
+    name: str
+    stage: str
+    moves: tuple[Move, ...]
+    value: int | None = None
+    best_moves: tuple[Move, ...] = ()
+    depth: int = 0
+
+    @property
+    def state(self) -> State:
+        return reduce(play, self.moves, State())
+
+
+POSITIONS = {position.name: position for position in (
+    Position("empty", "opening", (), depth=6),
+    Position("opening-1", "opening", (7, (2, 1), 1, (3, 0)), depth=8),
+    Position("opening-2", "opening", (8, (2, 3), 13, (3, 0), 15), depth=8),
+    Position("midgame-1", "midgame", (7, (2, 1), 1, (3, 0), 8, (1, 3), 3, (0, 1), 2, (0, 0), 11, (3, 1), 9, (0, 2)),
+             0, (12,)),
+    Position("midgame-2", "midgame", (8, (2, 3), 13, (3, 0), 15, (3, 1), 11, (2, 0), 0, (1, 3), 4, (3, 3), 1, (0, 2)),
+             -1, (3,)),
+    Position("endgame-1", "endgame", (1, (0, 2), 2, (1, 2), 15, (0, 3), 13, (3, 3), 12, (1, 3), 6, (3, 1), 5, (3, 2), 0,
+                                      (1, 0), 11),
+             -1, ((2, 3),)),
+    Position("endgame-2", "endgame", (7, (1, 0), 5, (3, 3), 11, (2, 0), 13, (2, 3), 1, (3, 0), 0, (2, 1), 8, (3, 1), 6,
+                                      (0, 3), 15),
+             -1, ((0, 0), (1, 1), (1, 3))),
+    Position("endgame-3", "endgame", (10, (1, 0), 6, (2, 3), 0, (0, 1), 11, (0, 2), 7, (3, 1), 1, (3, 0), 5, (0, 0), 3,
+                                      (2, 2), 14, (1, 1), 4, (0, 3)),
+             0, (8, 12, 15)),
+    Position("endgame-4", "endgame", (6, (0, 0), 9, (3, 0), 0, (0, 3), 4, (0, 1), 1, (3, 2), 5, (2, 0), 8, (1, 0), 12,
+                                      (3, 1), 13, (2, 1), 10, (1, 2)),
+             1, (11,)),
+)}
@@ -0,0 +1,136 @@
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+import argparse
+import json
+import logging
+import platform
+import random
+import sys
+import time
+
+from quarto.bench.positions import POSITIONS, Position
+from quarto.mcts.node import get_best_move
+from quarto.mcts.search import MCTS
+from quarto.mcts.stoppers import MaxIters
+from quarto.mtdf.mtdf import MTDFSolver, SearchStats
+from quarto.representation.logic import LAST_PLY
+
+
+@dataclass(slots=True)
+class Result:
+    engine: str
+    position: str
+    stage: str
+    seconds: float
+    nodes: int = 0
+    hit_rate: float | None = None
+    searches: list[int] | None = None
+    value: float | None = None
+    correct: bool | None = None
+    agreement: float | None = None
+
+    @property
+    def nodes_per_sec(self) -> float:
+        return self.nodes / self.seconds
+
+    def to_dict(self) -> dict:
+        return asdict(self) | {"nodes_per_sec": self.nodes_per_sec}
+
+
+def get_depth(position: Position) -> int:
+    return 2*LAST_PLY if position.value is not None else position.depth
+
+
+def run_solver(engine: str, position: Position, search: Callable[[MTDFSolver], float]) -> Result:
+    solver = MTDFSolver(stats=SearchStats())
+    start = time.perf_counter()
+    value = search(solver)
+    seconds = time.perf_counter() - start
+    correct = None if position.value is None else value == position.value
+    stats = solver.stats
+    assert stats is not None
+    return Result(engine, position.name, position.stage, seconds, stats.nodes, stats.hit_rate,
+                  stats.searches or None, value, correct)
+
+
+def bench_alphabeta(position: Position, mcts_iterations: int, mcts_runs: int) -> Result:
+    state, depth = position.state, get_depth(position)
+    return run_solver("alphabeta", position, lambda solver: solver.alphabeta(state, depth)[0])
+
+
+def bench_mtdf(position: Position, mcts_iterations: int, mcts_runs: int) -> Result:
+    state, depth = position.state, get_depth(position)
+    return run_solver("mtdf", position, lambda solver: solver.MTDF(state, 0, depth))
+
+
+def bench_iterative_deepening(position: Position, mcts_iterations: int, mcts_runs: int) -> Result:
+    state, depth = position.state, get_depth(position)
+    return run_solver("iterative_deepening", position, lambda solver: solver.iterative_deepening(state, depth))
+
+
+def bench_mcts(position: Position, mcts_iterations: int, mcts_runs: int) -> Result:
+    state, seconds, nodes, agreed = position.state, 0., 0, 0
+    for run in range(mcts_runs):
+        random.seed(run)
+        start = time.perf_counter()
+        root = MCTS(MaxIters(mcts_iterations)).search(state)
+        seconds += time.perf_counter() - start
+        nodes += root.visits
+        agreed += get_best_move(root) in position.best_moves
+    agreement = agreed / mcts_runs if position.best_moves else None
+    return Result("mcts", position.name, position.stage, seconds, nodes, agreement=agreement)
+
+
+BenchF = Callable[[Position, int, int], Result]
+ENGINES: dict[str, BenchF] = {
+    "alphabeta": bench_alphabeta,
+    "mtdf": bench_mtdf,
+    "iterative_deepening": bench_iterative_deepening,
+    "mcts": bench_mcts,
+}
+
+
+def run(engines: Sequence[str], positions: Sequence[str], mcts_iterations: int = 1_000,
+        mcts_runs: int = 10) -> list[Result]:
+    results = []
+    for name in positions:
+        position = POSITIONS[name]
+        for engine in engines:
+            result = ENGINES[engine](position, mcts_iterations, mcts_runs)
+            logging.info(f"{result.position:<12}{result.engine:<20}{result.seconds:>9.3f} s"
+                         f"{result.nodes_per_sec:>12,.0f} nodes/s\tvalue={result.value}\tagreement={result.agreement}")
+            results.append(result)
+    return results
+
+
+def main(argv: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m quarto.bench.search")
+    parser.add_argument("--engine", action="append", choices=list(ENGINES),
+                        help="engine to measure (repeatable, default: all)")
+    parser.add_argument("--position", action="append", choices=list(POSITIONS),
+                        help="corpus position (repeatable, default: all)")
+    parser.add_argument("--mcts-iterations", type=int, default=1_000)
+    parser.add_argument("--mcts-runs", type=int, default=10, help="seeded MCTS searches per position")
+    parser.add_argument("--output", default="-", help="JSON report path ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    results = run(args.engine or list(ENGINES), args.position or list(POSITIONS), args.mcts_iterations, args.mcts_runs)
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "mcts_iterations": args.mcts_iterations,
+        "mcts_runs": args.mcts_runs,
+        "results": [result.to_dict() for result in results],
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from collections import defaultdict
 from collections.abc import Hashable, Mapping, MutableMapping
 from typing import Any, Callable, ItemsView, Iterator, KeysView, Protocol, TypeVar, ValuesView
 import fractions
+import sys
 
 class SupportsAdd(Protocol):
 
@@ -52,6 +53,9 @@ class cumdict(MutableMapping[K, V]):
 
     def __repr__(self) -> str:
         return repr(dict(self.__data))
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(vars(self)) + sys.getsizeof(self.__data)
     
     def to_dict(self) -> dict[K, V]:
         return dict(self.__data)
@@ -1,10 +1,11 @@
 from collections.abc import Iterable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable
 import random
 
 from quarto.mcts.node import Node, get_child
 from quarto.representation.logic import State, Move, get_moves
+from quarto.representation.symmetry import get_unique_moves
 
 
 def expand(parent: Node) -> Iterable[Node]:
@@ -19,6 +20,7 @@ def expand(parent: Node) -> Iterable[Node]:
 
 
 GetMovesF = Callable[[State], Iterable[Move]]
+WideningF = Callable[[int], int]
 
 
 @dataclass(slots=True, frozen=True)
@@ -37,3 +39,30 @@ class Expand:
             k = n
         exploring = random.sample(unexplored, k)
         return [get_child(parent, move) for move in exploring]
+
+
+@dataclass(slots=True, frozen=True)
+class Widening:
+    coefficient: float = 1.
+    exponent: float = .5
+
+    def __call__(self, visits: int) -> int:
+        return max(1, int(self.coefficient * visits ** self.exponent))
+
+
+@dataclass(slots=True, frozen=True)
+class ProgressiveExpand:
+    widening: WideningF = field(default_factory=Widening)
+    get_moves: GetMovesF = get_unique_moves
+
+    def __call__(self, parent: Node) -> Iterable[Node]:
+        if parent.game_over:
+            return [parent]
+        moves = self.get_moves(parent.state)
+        unexplored = [move for move in moves if move not in parent.children]
+        k = max(1, self.widening(parent.visits) - len(parent.children))
+        if (n := len(unexplored)) <= k:
+            parent.fully_expanded = True
+            k = n
+        exploring = random.sample(unexplored, k)
+        return [get_child(parent, move) for move in exploring]
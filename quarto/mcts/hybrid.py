@@ -0,0 +1,29 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+from quarto.mcts.node import Node
+from quarto.mcts.simulate import Simulator
+from quarto.mtdf.mtdf import MTDFSolver
+from quarto.representation.logic import LAST_PLY, count_free
+from quarto.representation.payoffs import Payoffs
+from quarto.representation.player import Player
+
+
+SimulateF = Callable[[Node], Payoffs]
+
+
+@dataclass(slots=True)
+class ExactSimulator:
+    threshold: int = 7
+    simulate: SimulateF = field(default_factory=Simulator)
+    max_entries: int = 1_000_000
+    solver: MTDFSolver = field(default_factory=MTDFSolver)
+
+    def __call__(self, node: Node) -> Payoffs:
+        if node.game_over or count_free(node.state) >= self.threshold:
+            return self.simulate(node)
+        if len(self.solver.table) > self.max_entries:
+            self.solver.table.clear()
+        value, _ = self.solver.alphabeta(node.state, 2*LAST_PLY)
+        node.proven = payoffs = {Player.PLAYER1: value, Player.PLAYER2: -value}
+        return payoffs
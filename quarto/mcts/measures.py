@@ -2,6 +2,7 @@ from dataclasses import dataclass
 import math
 
 from quarto.mcts.node import Node
+from quarto.representation.player import Player
 
 
 @dataclass(slots=True)
@@ -13,3 +14,30 @@ class UCT:
         exploitation = child.payoffs[player] / child.visits
         exploration = self.exploration_rate * math.sqrt(math.log(child.parent.visits) / child.visits)  # type: ignore
         return exploitation + exploration
+
+
+@dataclass(slots=True)
+class ZeroSumUCT:
+    exploration_rate: float = math.sqrt(2)
+
+    def __call__(self, child: Node) -> float:
+        exploitation = child.value / child.visits
+        if child.parent.plying != Player.PLAYER1:  # type: ignore
+            exploitation = -exploitation
+        exploration = self.exploration_rate * math.sqrt(math.log(child.parent.visits) / child.visits)  # type: ignore
+        return exploitation + exploration
+
+
+@dataclass(slots=True)
+class RAVE:
+    exploration_rate: float = math.sqrt(2)
+    equivalence: float = 10.
+
+    def __call__(self, child: Node) -> float:
+        player = child.parent.plying  # type: ignore
+        exploitation = child.payoffs[player] / child.visits
+        if child.amaf_visits:
+            beta = math.sqrt(self.equivalence / (3 * child.visits + self.equivalence))
+            exploitation = (1 - beta) * exploitation + beta * child.amaf_value / child.amaf_visits
+        exploration = self.exploration_rate * math.sqrt(math.log(child.parent.visits) / child.visits)  # type: ignore
+        return exploitation + exploration
@@ -1,8 +1,12 @@
 from dataclasses import dataclass, field
+from operator import itemgetter
 from quarto.representation.logic import Payoffs, State, Player, Move, get_ply, get_plying, is_over, get_winner, play
 from quarto.mcts.cumdict import cumdict, normalize
 
 
+Rollout = tuple[Payoffs, tuple[tuple[Player, Move], ...]]
+
+
 @dataclass(slots=True)
 class Node:
     state: State
@@ -12,19 +16,26 @@ class Node:
     
     depth: int = 0
     parent: "Node | None" = None
+    move: Move | None = None
     children: dict[Move, "Node"] = field(init=False, default_factory=dict)
 
-    payoffs: cumdict[Player, float] = field(init=False, default_factory=cumdict)
+    payoffs: cumdict[Player, float] | None = field(default_factory=cumdict)
+    value: float = field(init=False, default=0.)
+    squares: float = field(init=False, default=0.)
     visits: int = field(init=False, default=0)
 
     fully_expanded: bool = field(init=False, default=False)
+    proven: Payoffs | None = field(init=False, default=None)
+
+    amaf_value: float = field(init=False, default=0.)
+    amaf_visits: int = field(init=False, default=0)
 
 
-def get_root(state: State) -> Node:
+def get_root(state: State, zero_sum: bool = False) -> Node:
     plying = get_plying(get_ply(state))
     game_over = is_over(state)
     winner = None if not game_over else get_winner(state)
-    return Node(state, plying, game_over, winner)
+    return Node(state, plying, game_over, winner, payoffs=None if zero_sum else cumdict())
 
 
 def get_child(parent: Node, move: Move) -> Node:
@@ -32,11 +43,77 @@ def get_child(parent: Node, move: Move) -> Node:
     plying = get_plying(get_ply(state))
     game_over = is_over(state)
     winner = None if not game_over else get_winner(state)
-    child = Node(state, plying, game_over, winner, parent.depth+1, parent)
+    payoffs = None if parent.payoffs is None else cumdict()
+    child = Node(state, plying, game_over, winner, parent.depth+1, parent, move, payoffs)
     parent.children[move] = child
     return child
 
 
+def get_state(node: Node) -> State:
+    moves = []
+    while node.state is None:
+        moves.append(node.move)
+        node = node.parent  # type: ignore
+    state = node.state.copy()
+    for move in reversed(moves):
+        play(state, move, inplace=True)  # type: ignore
+    return state
+
+
+def count_nodes(root: Node) -> int:
+    n_nodes, stack = 0, [root]
+    while stack:
+        node = stack.pop()
+        n_nodes += 1
+        stack.extend(node.children.values())
+    return n_nodes
+
+
+def is_attached(node: Node, root: Node) -> bool:
+    while node is not root:
+        if (parent := node.parent) is None or parent.children.get(node.move) is not node:  # type: ignore
+            return False
+        node = parent
+    return True
+
+
+def prune(root: Node, target: int) -> int:
+    order, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(node.children.values())
+    sizes = {}
+    for node in reversed(order):
+        sizes[id(node)] = 1 + sum(sizes[id(child)] for child in node.children.values())
+    n_nodes = sizes[id(root)]
+    candidates = sorted((node for node in order if node.children and node is not root), key=lambda node: node.visits)
+    for node in candidates:
+        if n_nodes <= target:
+            break
+        if not is_attached(node, root):
+            continue
+        removed = sizes[id(node)] - 1
+        node.children = {}
+        node.fully_expanded = False
+        n_nodes -= removed
+        while node is not root:
+            node = node.parent  # type: ignore
+            sizes[id(node)] -= removed
+    return n_nodes
+
+
+def apply_virtual_loss(node: Node, count: int = 1):
+    while (parent := node.parent) is not None:
+        node.visits += count
+        if node.payoffs is None:
+            node.value += -count if parent.plying == Player.PLAYER1 else count
+        else:
+            node.payoffs[parent.plying] = -count
+        node = parent
+    node.visits += count
+
+
 def back_propagate(node: Node, payoffs: Payoffs):
     while True:
         node.payoffs.update(payoffs)
@@ -46,5 +123,84 @@ def back_propagate(node: Node, payoffs: Payoffs):
         node = node.parent
 
 
+def zero_sum_propagate(node: Node, value: float):
+    squared = value * value
+    while True:
+        node.value += value
+        node.squares += squared
+        node.visits += 1
+        if node.parent is None:
+            break
+        node = node.parent
+
+
+def rave_propagate(node: Node, rollout: "Rollout"):
+    payoffs, played = rollout
+    played = set(played)
+    while True:
+        for move, child in node.children.items():
+            if (node.plying, move) in played:
+                child.amaf_value += payoffs[node.plying]
+                child.amaf_visits += 1
+        node.payoffs.update(payoffs)
+        node.visits += 1
+        if node.parent is None:
+            break
+        played.add((node.parent.plying, node.move))
+        node = node.parent
+
+
+def solve_propagate(node: Node, payoffs: Payoffs):
+    if node.game_over:
+        node.proven = payoffs
+    while True:
+        if node.proven is not None:
+            payoffs = node.proven
+        node.payoffs.update(payoffs)
+        node.visits += 1
+        if (parent := node.parent) is None:
+            break
+        if node.proven is not None and parent.proven is None:
+            parent.proven = get_proven(parent, node)
+        node = parent
+
+
+def get_proven(parent: Node, child: Node) -> Payoffs | None:
+    assert child.proven is not None
+    if child.proven[parent.plying] > 0:
+        return child.proven
+    if not parent.fully_expanded:
+        return None
+    outcomes = [child.proven for child in parent.children.values()]
+    if any(outcome is None for outcome in outcomes):
+        return None
+    return max(outcomes, key=itemgetter(parent.plying))  # type: ignore
+
+
+def get_value(node: Node, player: Player) -> float:
+    if node.proven is not None:
+        return node.proven[player]
+    if node.payoffs is None:
+        return (node.value if player == Player.PLAYER1 else -node.value) / node.visits
+    return node.payoffs[player] / node.visits
+
+
+def get_variance(node: Node) -> float:
+    mean = node.value / node.visits
+    return node.squares / node.visits - mean * mean
+
+
+def get_best_move(node: Node) -> Move:
+    player = node.plying
+    if node.proven is not None:
+        proven = next((move for move, child in node.children.items()
+                       if child.proven is not None and child.proven[player] == node.proven[player]), None)
+        if proven is not None:
+            return proven
+    return max(node.children, key=lambda move: get_value(node.children[move], player))
+
+
 def node_to_string(node: Node) -> str:
+    if node.payoffs is None:
+        return f"value={node.value / node.visits:+.3f}\tvariance={get_variance(node):.3f}"
     return (f"{normalize(node.payoffs, node.visits)=}")
@@ -1,8 +1,33 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
 import random
 
+from quarto.representation.logic import PIECE, State, completes, get_open_lines, get_phase
 from quarto.representation.move import Move
+from quarto.representation.phase import Phase
 
 
 def random_policy(moves: Iterable[Move]) -> Move:
     return random.choice(list(moves))
+
+
+@dataclass(slots=True)
+class HeavyPolicy:
+    epsilon: float = .1
+
+    def __call__(self, state: State, moves: Sequence[Move]) -> Move:
+        if random.random() < self.epsilon:
+            return random.choice(moves)
+        open_lines = get_open_lines(state)
+        if get_phase(state) == Phase.PUT:
+            hand = state[PIECE]
+            for square, and_mask, nor_mask in open_lines:
+                if completes(hand, and_mask, nor_mask):
+                    return square
+            return random.choice(moves)
+        and_any, nor_any = 0, 0
+        for _, and_mask, nor_mask in open_lines:
+            and_any |= and_mask
+            nor_any |= nor_mask
+        safe = [piece for piece in moves if not completes(piece, and_any, nor_any)]  # type: ignore
+        return random.choice(safe or moves)
@@ -1,22 +1,29 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
 from typing import Callable
 import concurrent.futures as cf
+import logging
+import time
 from quarto.mcts.dummy_executor import DummyExecutor
 from quarto.mcts.expand import expand
 
-from quarto.mcts.node import Node, get_root, back_propagate
+from quarto.mcts.measures import ZeroSumUCT
+from quarto.mcts.node import (Node, apply_virtual_loss, count_nodes, get_root, get_state, back_propagate, prune,
+                              zero_sum_propagate)
 from quarto.mcts.simulate import Simulator
 from quarto.mcts.stoppers import MaxIters
 from quarto.mcts.select import Select
-from quarto.representation.logic import State
+from quarto.mcts.telemetry import Telemetry, get_tree_size
+from quarto.representation.logic import State, get_payoff, get_payoffs
 from quarto.representation.payoffs import Payoffs
 
 
-StopF = Callable[[int], bool]
+StopF = Callable[[int, Node], bool]
 TraverseF = Callable[[Node], Node]
 ExpandF = Callable[[Node], Iterable[Node]]
 SimulateF = Callable[[Node], Payoffs]
+BackPropagateF = Callable[[Node, Payoffs], None]
+EvaluateF = Callable[[Sequence[Node]], Iterable[Payoffs]]
 
 
 @dataclass(slots=True)
@@ -26,23 +33,113 @@ class MCTS:
     expand: ExpandF = expand
     simulate: SimulateF = field(default_factory=Simulator)
     executor: cf.Executor = field(default_factory=DummyExecutor)
+    back_propagate: BackPropagateF = back_propagate
+    telemetry: Telemetry | None = None
+    zero_sum: bool = False
+    lean: bool = False
+    max_nodes: int = 0
+    prune_ratio: float = .8
+    batch_size: int = 1
+    evaluate: EvaluateF | None = None
+
+    def __post_init__(self):
+        if self.zero_sum != (self.back_propagate is zero_sum_propagate):
+            raise ValueError(f"{self.zero_sum=} does not match {self.back_propagate=}")
+        if (measure := getattr(self.select, 'measure', None)) is not None and \
+                self.zero_sum != isinstance(measure, ZeroSumUCT):
+            raise ValueError(f"{self.zero_sum=} does not match {measure=}")
+        if getattr(self.simulate, 'get_payoffs', None) is (get_payoffs if self.zero_sum else get_payoff):
+            raise ValueError(f"{self.zero_sum=} does not match {self.simulate=}")
 
     def search(self, state: State, __root: Node | None = None) -> Node:
-        root = get_root(state) if __root is None else __root
-        if root.game_over:
+        root = get_root(state, self.zero_sum) if __root is None else __root
+        if self.lean:
+            root.state = state
+        if root.proven is not None and not root.children:
+            root.proven = None
+        if root.game_over or root.proven is not None:
             return root
         self._loop(root)
         return root
     
     def _loop(self, root: Node):
         iteration = 0
-        while not self.stop(iteration):
-            self._iterate(root)
-            iteration += 1
+        n_nodes = count_nodes(root) if self.max_nodes else 0
+        while root.proven is None and not self.stop(iteration, root):
+            if self.batch_size > 1:
+                n_nodes = self._bound(root, n_nodes + self._iterate_batch(root))
+                iteration += self.batch_size
+            else:
+                n_nodes = self._bound(root, n_nodes + self._iterate(root))
+                iteration += 1
+        if self.telemetry is not None:
+            self.telemetry.searches += 1
+            self.telemetry.tree_nodes, self.telemetry.memory = get_tree_size(root)
+
+    def _bound(self, root: Node, n_nodes: int) -> int:
+        if self.max_nodes and n_nodes > self.max_nodes:
+            n_nodes = prune(root, int(self.max_nodes * self.prune_ratio))
+            logging.debug(f"pruned to {n_nodes=:,}")
+        return n_nodes
 
-    def _iterate(self, root: Node):
+    def _select(self, root: Node) -> Node:
         leaf = self.select(root)
+        if self.lean and leaf.state is None:
+            leaf.state = get_state(leaf)
+        return leaf
+
+    def _iterate(self, root: Node) -> int:
+        start = time.perf_counter()
+        leaf = self._select(root)
+        selected = time.perf_counter()
         expanded = self.expand(leaf)
-        results = self.executor.map(self.simulate, expanded)
+        expanding = time.perf_counter()
+        results = list(self.executor.map(self.simulate, expanded))
+        simulated = time.perf_counter()
         for node, payoffs in zip(expanded, results):
-            back_propagate(node, payoffs)
+            self.back_propagate(node, payoffs)
+        if self.lean:
+            release(root, [leaf, *expanded])
+        created = sum(node is not leaf for node in expanded)
+        if self.telemetry is not None:
+            self.telemetry.record([leaf.depth - root.depth], created, selected - start, expanding - selected,
+                                  simulated - expanding, time.perf_counter() - simulated)
+        return created
+
+    def _iterate_batch(self, root: Node) -> int:
+        leaves, pending = [], []
+        select_time, expand_time = 0., 0.
+        for _ in range(self.batch_size):
+            start = time.perf_counter()
+            leaf = self._select(root)
+            selected = time.perf_counter()
+            expanded = list(self.expand(leaf))
+            for node in expanded:
+                apply_virtual_loss(node)
+            select_time += selected - start
+            expand_time += time.perf_counter() - selected
+            leaves.append(leaf)
+            pending.extend(expanded)
+        expanding = time.perf_counter()
+        if self.evaluate is None:
+            results = list(self.executor.map(self.simulate, pending))
+        else:
+            results = list(self.evaluate(pending))
+        simulated = time.perf_counter()
+        for node in pending:
+            apply_virtual_loss(node, -1)
+        for node, payoffs in zip(pending, results):
+            self.back_propagate(node, payoffs)
+        if self.lean:
+            release(root, [*leaves, *pending])
+        created = sum(all(node is not leaf for leaf in leaves) for node in pending)
+        if self.telemetry is not None:
+            self.telemetry.record([leaf.depth - root.depth for leaf in leaves], created, select_time, expand_time,
+                                  simulated - expanding, time.perf_counter() - simulated)
+        return created
+
+
+def release(root: Node, nodes: Iterable[Node]):
+    for node in nodes:
+        if node is not root:
+            node.state = None  # type: ignore
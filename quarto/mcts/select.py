@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Callable
 
+from quarto.mcts.expand import Widening, WideningF
 from quarto.mcts.node import Node
 from quarto.mcts.measures import UCT
 
@@ -16,3 +17,25 @@ class Select:
         while node.fully_expanded:
             node = max(node.children.values(), key=self.measure)
         return node
+
+
+@dataclass(slots=True)
+class SolverSelect:
+     measure: MeasureF = field(default_factory=UCT)
+
+     def __call__(self, node: Node) -> Node:
+        while node.fully_expanded:
+            unproven = [child for child in node.children.values() if child.proven is None]
+            node = max(unproven, key=self.measure)
+        return node
+
+
+@dataclass(slots=True)
+class ProgressiveSelect:
+     measure: MeasureF = field(default_factory=UCT)
+     widening: WideningF = field(default_factory=Widening)
+
+     def __call__(self, node: Node) -> Node:
+        while node.fully_expanded or (node.children and len(node.children) >= self.widening(node.visits)):
+            node = max(node.children.values(), key=self.measure)
+        return node
@@ -1,20 +1,22 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
 from typing import Callable
 import concurrent.futures as cf
 
 from quarto.mcts.cumdict import cumdict, normalize
 from quarto.mcts.dummy_executor import DummyExecutor
-from quarto.mcts.node import Node
-from quarto.mcts.policies import random_policy
-from quarto.representation.logic import State, is_over, get_payoffs, play, get_moves
+from quarto.mcts.node import Node, Rollout
+from quarto.mcts.policies import HeavyPolicy, random_policy
+from quarto.representation.logic import State, is_over, get_payoffs, play, get_moves, get_ply
 from quarto.representation.move import Move
 from quarto.representation.payoffs import Payoffs
+from quarto.representation.player import get_plying
 
 
 StopSimF = Callable[[State], bool]
 GetMovesF = Callable[[State], Iterable[Move]]
 PolicyF = Callable[[Iterable[Move]], Move]
+StatePolicyF = Callable[[State, Sequence[Move]], Move]
 GetPayoffsF = Callable[[State], Payoffs]
 SimulateF = Callable[[Node], Payoffs]
 
@@ -35,6 +37,39 @@ class Simulator:
         return self.get_payoffs(state)
 
 
+@dataclass(slots=True)
+class HeavySimulator:
+    stop: StopSimF = is_over
+    get_moves: GetMovesF = get_moves
+    policy: StatePolicyF = field(default_factory=HeavyPolicy)
+    get_payoffs: GetPayoffsF = get_payoffs
+
+    def __call__(self, node: Node) -> Payoffs:
+        state = node.state.copy()
+        while not self.stop(state):
+            moves = self.get_moves(state)
+            play(state, self.policy(state, moves), inplace=True)  # type: ignore
+        return self.get_payoffs(state)
+
+
+@dataclass(slots=True)
+class RaveSimulator:
+    stop: StopSimF = is_over
+    get_moves: GetMovesF = get_moves
+    policy: PolicyF = random_policy
+    get_payoffs: GetPayoffsF = get_payoffs
+
+    def __call__(self, node: Node) -> Rollout:
+        state = node.state
+        played = []
+        while not self.stop(state):
+            moves = self.get_moves(state)
+            move = self.policy(moves)
+            played.append((get_plying(get_ply(state)), move))
+            state = play(state, move)
+        return self.get_payoffs(state), tuple(played)
+
+
 @dataclass(slots=True)
 class BatchSimulator:
     n_sims: int = 32
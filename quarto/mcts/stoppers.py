@@ -1,11 +1,21 @@
 from collections.abc import Collection
-from dataclasses import dataclass
-from typing import Callable
+from dataclasses import dataclass, field
+from typing import Callable, Protocol
+import math
 import threading
 import time
 
+from quarto.mcts.node import Node, get_value
 
-StopF = Callable[[int], bool]
+
+StopF = Callable[[int, Node], bool]
+
+
+class BudgetF(Protocol):
+
+    def __call__(self, iteration: int, root: Node) -> bool: ...
+
+    def remaining(self, iteration: int) -> float: ...
 
 
 @dataclass(slots=True)
@@ -13,25 +23,34 @@ class MaxTime:
     max_time: float
     start: float = float('-inf')
 
-    def __call__(self, iteration: int) -> bool:
+    def __call__(self, iteration: int, root: Node) -> bool:
         if iteration == 0:
             self.start = time.perf_counter()
         return time.perf_counter() - self.start >= self.max_time
+
+    def remaining(self, iteration: int) -> float:
+        elapsed = time.perf_counter() - self.start
+        if elapsed <= 0:
+            return float('inf')
+        return (self.max_time - elapsed) * iteration / elapsed
     
 
 @dataclass(slots=True)
 class MaxIters:
     max_iterations: int
 
-    def __call__(self, iteration: int) -> bool:
+    def __call__(self, iteration: int, root: Node) -> bool:
         return iteration >= self.max_iterations
 
+    def remaining(self, iteration: int) -> float:
+        return self.max_iterations - iteration
+
 
 @dataclass(slots=True)
 class Asynchronous:
     stop: threading.Event
 
-    def __call__(self, _: int) -> bool:
+    def __call__(self, iteration: int, root: Node) -> bool:
         return self.stop.is_set()
 
 
@@ -39,5 +58,31 @@ class Asynchronous:
 class FirstOf:
     stops: Collection[StopF]
 
-    def __call__(self, iteration: int) -> bool:
-        return any(stop(iteration) for stop in self.stops)
+    def __call__(self, iteration: int, root: Node) -> bool:
+        return any(stop(iteration, root) for stop in self.stops)
+
+
+@dataclass(slots=True)
+class Confident:
+    budget: BudgetF
+    min_iterations: int = 256
+    every: int = 16
+    z: float = 3.
+    last: int = field(init=False, default=0)
+
+    def __call__(self, iteration: int, root: Node) -> bool:
+        if iteration == 0:
+            self.last = 0
+        if self.budget(iteration, root):
+            return True
+        if iteration < self.min_iterations or iteration - self.last < self.every or len(root.children) < 2:
+            return False
+        self.last = iteration
+        children = sorted(root.children.values(), key=lambda child: child.visits, reverse=True)
+        first, second = children[0], children[1]
+        if first.visits - second.visits > self.budget.remaining(iteration):
+            return True
+        if not root.fully_expanded:
+            return False
+        lower = get_value(first, root.plying) - self.z / math.sqrt(first.visits)
+        return all(lower > get_value(child, root.plying) + self.z / math.sqrt(child.visits) for child in children[1:])
@@ -0,0 +1,96 @@
+import struct
+
+from quarto.mcts.node import Node, get_child, get_root
+from quarto.representation.move import Move
+from quarto.representation.packed import SORTED_SQUARES, SQUARE_INDICES, pack, unpack
+from quarto.representation.player import Player
+
+
+MAGIC = b'QMCT'
+VERSION = 1
+HEADER = struct.Struct('<4sBBI16s')
+RECORD = struct.Struct('<BBBIdd')
+NO_MOVE = 255
+SQUARE_OFFSET = 16
+ZERO_SUM = 1
+FULLY_EXPANDED = 1
+PROVEN_SHIFT = 1
+PROVEN = {None: 0, 1: 1, -1: 2, 0: 3}
+OUTCOMES = {code: value for value, code in PROVEN.items()}
+
+
+def encode_move(move: Move | None) -> int:
+    if move is None:
+        return NO_MOVE
+    if isinstance(move, tuple):
+        return SQUARE_OFFSET + SQUARE_INDICES[move]
+    return move
+
+
+def decode_move(code: int) -> Move:
+    if code >= SQUARE_OFFSET:
+        return SORTED_SQUARES[code - SQUARE_OFFSET]
+    return code
+
+
+def encode_node(node: Node) -> bytes:
+    value = node.value if node.payoffs is None else node.payoffs[Player.PLAYER1]
+    proven = None if node.proven is None else node.proven[Player.PLAYER1]
+    flags = node.fully_expanded | PROVEN[proven] << PROVEN_SHIFT
+    return RECORD.pack(encode_move(node.move), flags, len(node.children), node.visits, value, node.squares)
+
+
+def to_bytes(root: Node) -> bytes:
+    records, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        records.append(encode_node(node))
+        stack.extend(reversed(node.children.values()))
+    flags = ZERO_SUM if root.payoffs is None else 0
+    header = HEADER.pack(MAGIC, VERSION, flags, len(records), pack(root.state).to_bytes(16, 'little'))
+    return header + b''.join(records)
+
+
+def decode_node(node: Node, data: bytes, offset: int) -> int:
+    _, flags, n_children, node.visits, value, node.squares = RECORD.unpack_from(data, offset)
+    if node.payoffs is None:
+        node.value = value
+    else:
+        node.payoffs.update({Player.PLAYER1: value, Player.PLAYER2: -value})
+    node.fully_expanded = bool(flags & FULLY_EXPANDED)
+    if (proven := OUTCOMES[flags >> PROVEN_SHIFT]) is not None:
+        node.proven = {Player.PLAYER1: proven, Player.PLAYER2: -proven}
+    return n_children
+
+
+def from_bytes(data: bytes, lean: bool = False) -> Node:
+    magic, version, flags, n_records, packed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not an MCTS tree: {magic=} {version=}")
+    root = get_root(unpack(int.from_bytes(packed, 'little')), bool(flags & ZERO_SUM))
+    offset = HEADER.size
+    stack = [(root, decode_node(root, data, offset))]
+    for _ in range(n_records - 1):
+        offset += RECORD.size
+        while stack[-1][1] == 0:
+            node, _ = stack.pop()
+            if lean and node is not root:
+                node.state = None  # type: ignore
+        parent, remaining = stack[-1]
+        stack[-1] = parent, remaining - 1
+        child = get_child(parent, decode_move(data[offset]))
+        stack.append((child, decode_node(child, data, offset)))
+    if lean:
+        for node, _ in stack[1:]:
+            node.state = None  # type: ignore
+    return root
+
+
+def save(root: Node, path: str):
+    with open(path, 'wb') as file:
+        file.write(to_bytes(root))
+
+
+def load(path: str, lean: bool = False) -> Node:
+    with open(path, 'rb') as file:
+        return from_bytes(file.read(), lean)
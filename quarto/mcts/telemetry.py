@@ -0,0 +1,68 @@
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+import sys
+
+from quarto.mcts.node import Node
+
+
+@dataclass(slots=True)
+class Telemetry:
+    searches: int = 0
+    iterations: int = 0
+    nodes: int = 0
+    max_depth: int = 0
+    total_depth: int = 0
+    depths: Counter[int] = field(default_factory=Counter)
+    select_time: float = 0.
+    expand_time: float = 0.
+    simulate_time: float = 0.
+    backprop_time: float = 0.
+    tree_nodes: int = 0
+    memory: int = 0
+
+    def record(self, depths: Iterable[int], created: int, select_time: float, expand_time: float,
+               simulate_time: float, backprop_time: float):
+        for depth in depths:
+            self.iterations += 1
+            self.max_depth = max(self.max_depth, depth)
+            self.total_depth += depth
+            self.depths[depth] += 1
+        self.nodes += created
+        self.select_time += select_time
+        self.expand_time += expand_time
+        self.simulate_time += simulate_time
+        self.backprop_time += backprop_time
+
+    @property
+    def elapsed(self) -> float:
+        return self.select_time + self.expand_time + self.simulate_time + self.backprop_time
+
+    @property
+    def iterations_per_sec(self) -> float:
+        return self.iterations / self.elapsed if self.elapsed else 0.
+
+    @property
+    def mean_depth(self) -> float:
+        return self.total_depth / self.iterations if self.iterations else 0.
+
+    def __str__(self) -> str:
+        elapsed = self.elapsed or 1.
+        return (f"iterations={self.iterations:,}\t{self.iterations_per_sec:,.0f} it/s\tnodes={self.nodes:,}\t"
+                f"depth={self.mean_depth:.1f}/{self.max_depth}\t"
+                f"select={self.select_time / elapsed:.0%} expand={self.expand_time / elapsed:.0%} "
+                f"simulate={self.simulate_time / elapsed:.0%} backprop={self.backprop_time / elapsed:.0%}\t"
+                f"tree={self.tree_nodes:,} nodes, {self.memory / 2**20:.1f} MiB")
+
+
+def get_tree_size(root: Node) -> tuple[int, int]:
+    n_nodes, memory = 0, 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        n_nodes += 1
+        memory += sys.getsizeof(node) + sys.getsizeof(node.state) + sys.getsizeof(node.children)
+        if node.payoffs is not None:
+            memory += sys.getsizeof(node.payoffs)
+        stack.extend(node.children.values())
+    return n_nodes, memory
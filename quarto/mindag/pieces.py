@@ -5,7 +5,7 @@ from itertools import permutations, product
 from typing import Any, NamedTuple
 
 from quarto.representation.constants import ATTRIBUTES
-from quarto.representation.piece import PIECES, Piece
+from quarto.representation.piece import PIECES, Piece, piece_to_string
 from quarto.mindag.dag import Node, build_min_dag, dag_stats, plot_dag
 
 
@@ -17,27 +17,27 @@ class Mapping(NamedTuple):
     flipping: Piece
 
     def __str__(self):
-        return f"{''.join(map(str, self.permutation))}/{self.flipping}"
+        return f"{''.join(map(str, self.permutation))}/{piece_to_string(self.flipping)}"
 
 
 ALL_MAPPINGS = frozenset(Mapping(permutation, flipping) for permutation, flipping in product(permutations(range(ATTRIBUTES)), PIECES))
 SORTED_MAPPINGS = tuple(sorted(ALL_MAPPINGS))
-NULL_MAPPING = Mapping(permutation=tuple(range(ATTRIBUTES)), flipping=f"{0:0{ATTRIBUTES}b}")
+NULL_MAPPING = Mapping(permutation=tuple(range(ATTRIBUTES)), flipping=0)
 
 
 @cache
 def pieces_to_string(pieces: frozenset[Piece]) -> str:
-    return '-'.join(sorted(map(str, pieces)))
+    return '-'.join(map(piece_to_string, sorted(pieces)))
 
 
 @cache
 def flip(piece: Piece, flipping: Piece) -> Piece:
-    return f"{int(piece, base=2)^int(flipping, base=2):0{ATTRIBUTES}b}"
+    return piece ^ flipping
 
 
 @cache
 def permute(piece: Piece, permutation: tuple[int, ...]) -> Piece:
-    return ''.join(piece[i] for i in permutation)
+    return sum((piece >> (ATTRIBUTES-1-i) & 1) << (ATTRIBUTES-1-k) for k, i in enumerate(permutation))
 
 
 @cache
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+
+from quarto.representation.logic import PIECE, State, completes, get_available, get_open_lines, get_ply
+from quarto.representation.player import Player, get_plying
+
+
+@dataclass(slots=True)
+class Evaluator:
+    win: float = .75
+    parity: float = .25
+
+    def __call__(self, state: State) -> float:
+        open_lines = get_open_lines(state)
+        hand = state.get(PIECE)
+        if hand is not None and any(completes(hand, *masks) for _, *masks in open_lines):
+            value = self.win
+        else:
+            and_any, nor_any = 0, 0
+            for _, and_mask, nor_mask in open_lines:
+                and_any |= and_mask
+                nor_any |= nor_mask
+            used = frozenset(state.values())
+            safe = sum(not completes(piece, and_any, nor_any) for piece in get_available(used))
+            if hand is None and safe == 0:
+                value = -self.win
+            else:
+                value = self.parity if safe % 2 else -self.parity
+        return value if get_plying(get_ply(state)) == Player.PLAYER1 else -value
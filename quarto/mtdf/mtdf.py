@@ -1,16 +1,17 @@
 from concurrent.futures import ProcessPoolExecutor, wait
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
 from itertools import product
+from typing import Callable
 import logging
 import multiprocessing
+import threading
 import time
 
 from quarto.mindag.board import SORTED_TRANSFORMS, board_to_string, map_square
 from quarto.mindag.pieces import SORTED_MAPPINGS, map_piece
-from quarto.representation.constants import ATTRIBUTES
 from quarto.representation.move import Move
 from quarto.representation.logic import LAST_PLY, State, get_payoffs, get_ply, is_over, state_to_string, play, get_moves
+from quarto.representation.packed import Packed, pack
 from quarto.representation.player import Player, get_plying
 
 
@@ -23,177 +24,240 @@ class Entry:
     valid: bool = False
 
 
-TABLE = dict[str, Entry]()
-ITERS = 0
-FIRST_ENTERED = float('-inf')
-FIRST_EXITED = float('inf')
-EXITING = False
-START: datetime | None = None
+@dataclass(slots=True)
+class SearchStats:
+    hits: int = 0
+    cutoffs: int = 0
+    visits: dict[int, int] = field(default_factory=dict)
+    expanded: dict[int, int] = field(default_factory=dict)
+    searches: list[int] = field(default_factory=list)
+    times: dict[int, float] = field(default_factory=dict)
 
+    @property
+    def nodes(self) -> int:
+        return sum(self.visits.values())
 
-def lookup(state: State) -> Entry:
-    # if (entry := TABLE.get(state_to_string(state), Entry())).valid:
-    #     return entry
-    # for transform in SORTED_TRANSFORMS:
-    #     tmp = {map_square(square, transform): piece for square, piece in state.items()}
-    #     TABLE[state_to_string(tmp)] = entry
-    return TABLE.setdefault(state_to_string(state), Entry())
+    @property
+    def probes(self) -> int:
+        return self.nodes
 
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.
 
-# def lookup(state: State) -> Entry:
-#     # for mapping, transform in product(SORTED_MAPPINGS, SORTED_TRANSFORMS):
-#     #     tmp = {map_square(square, transform): map_piece(piece, mapping)
-#     #            for square, piece in state.items()}
-#     #     if (entry := TABLE.get(state_to_string(tmp))) is not None:
-#     #         return entry
-#     # return TABLE.setdefault(state_to_string(state), Entry())
+    @property
+    def branching(self) -> dict[int, float]:
+        return {depth: self.visits.get(depth-1, 0) / expanded for depth, expanded in sorted(self.expanded.items())}
 
+    def __str__(self) -> str:
+        return (f"nodes={self.nodes:,}\tprobes={self.probes:,}\thits={self.hits:,} ({self.hit_rate:.1%})\t"
+                f"cutoffs={self.cutoffs:,}\tsearches={self.searches}")
 
-def log_entered(depth: int):
-    global ITERS, FIRST_ENTERED, EXITING, START
-    ITERS += 1
-    EXITING = depth == 0
-    if START is None:
-        START = datetime.now()
-    human_depth = 2*LAST_PLY - depth
-    if human_depth > FIRST_ENTERED:
-        elapsed = (datetime.now() - START).total_seconds()
-        itps = ITERS / (elapsed + 1e-6)
-        FIRST_ENTERED = human_depth
-        logging.debug(f"{FIRST_ENTERED=}\t{ITERS=:,}\t{len(TABLE)=}")
 
+Table = dict[Packed, Entry]
+ReportF = Callable[[int, float, Move | None], None]
+EvaluateF = Callable[[State], float]
 
 
-def log_exited(depth: int):
-    global ITERS, FIRST_EXITED, EXITING, START
-    human_depth = 2*LAST_PLY - depth
-    if EXITING and human_depth < FIRST_EXITED:
-        elapsed = (datetime.now() - START).total_seconds()
-        itps = ITERS / (elapsed + 1e-6)
-        FIRST_EXITED = human_depth
-        logging.debug(f"{FIRST_EXITED=}\t{ITERS=:,}\t{elapsed!s}\t{itps:.3f} it/s\t{len(TABLE)=:,}")
+class SearchInterrupted(Exception):
+    pass
 
 
-def alphabeta(state: State, depth: int, alpha: float = float('-inf'),
-            beta: float = float('inf'), fail_soft: bool = True) -> tuple[int, int]:
-    log_entered(depth)
-                     
-    plying = get_plying(get_ply(state))
-
-    if (entry := lookup(state)).valid and entry.depth >= depth:
-        if entry.lower >= beta:
-            return entry.lower, entry.depth
-        if entry.upper <= alpha:
-            return entry.upper, entry.depth
-        alpha = max(alpha, entry.lower)
-        beta = min(beta, entry.upper)
-
-    if (game_over := is_over(state)) or depth <= 0:
-        best_value = get_payoffs(state)[Player.PLAYER1]
-        best_move = None
-        min_depth = depth if not game_over else float('inf')
-    elif plying == Player.PLAYER1:
-        best_value, best_move, min_depth = float('-inf'), None, float('inf')
-        a = alpha
-        for move in get_moves(state):
-            child = play(state, move)
-            value, plies = alphabeta(child, depth-1, a, beta, fail_soft)
-            if value > best_value:
-                best_value = value
-                best_move = move
-            min_depth = min(plies+1, min_depth)
-            if not fail_soft and best_value > beta:
-                break
-            a = max(a, best_value)
-            if fail_soft and best_value >= beta:
-                break
-    else:
-        best_value, best_move, min_depth = float('inf'), None, float('inf')
-        b = beta
-        for move in get_moves(state):
-            child = play(state, move)
-            value, plies = alphabeta(child, depth-1, alpha, b, fail_soft)
-            if value < best_value:
-                best_value = value
-                best_move = move
-            min_depth = min(plies+1, min_depth)
-            if not fail_soft and best_value < alpha:
-                break
-            b = min(b, best_value)
-            if fail_soft and best_value <= alpha:
-                break
-
-    if best_value <= alpha:
-        entry.upper = best_value
-    if alpha < best_value < beta:
-        entry.lower = best_value
-        entry.upper = best_value
-    if best_value >= beta:
-        entry.lower = best_value
-
-    if entry.lower > entry.upper:
-        logging.debug(f"{entry=}")
-
-    entry.best_move = best_move
-    entry.depth = min_depth
-    entry.valid = True
-
-    log_exited(depth)
-
-    return best_value, min_depth
-
-
-def MTDF(root: State, first_guess: int, depth: int, fail_soft: bool = True) -> int:
-    value = first_guess
-    upperbound = float('inf')
-    lowerbound = float('-inf')
-    while lowerbound < upperbound:
-        beta = value + 1 if value == lowerbound else value
-        value, _ = alphabeta(root, depth, beta-1, beta, fail_soft)
-        if value < beta:
-            upperbound = value
+@dataclass(slots=True)
+class MTDFSolver:
+    table: Table = field(default_factory=Table)
+    stats: SearchStats | None = None
+    fail_soft: bool = True
+    deadline: float = float('inf')
+    stop: threading.Event | None = None
+    check_every: int = 256
+    evaluate: EvaluateF | None = None
+    step: float = 1/64
+    countdown: int = field(init=False, default=0)
+
+    def check(self):
+        self.countdown = self.check_every
+        if time.perf_counter() >= self.deadline or (self.stop is not None and self.stop.is_set()):
+            raise SearchInterrupted
+
+    def lookup(self, state: State) -> Entry:
+        return self.table.setdefault(pack(state), Entry())
+
+    def alphabeta(self, state: State, depth: int, alpha: float = float('-inf'),
+                  beta: float = float('inf')) -> tuple[float, int | float]:
+        plying = get_plying(get_ply(state))
+        stats, fail_soft = self.stats, self.fail_soft
+
+        self.countdown -= 1
+        if self.countdown < 0:
+            self.check()
+        if stats is not None:
+            stats.visits[depth] = stats.visits.get(depth, 0) + 1
+        if (entry := self.lookup(state)).valid and entry.depth >= depth:
+            if stats is not None:
+                stats.hits += 1
+            if entry.lower >= beta:
+                if stats is not None:
+                    stats.cutoffs += 1
+                return entry.lower, entry.depth
+            if entry.upper <= alpha:
+                if stats is not None:
+                    stats.cutoffs += 1
+                return entry.upper, entry.depth
+            alpha = max(alpha, entry.lower)
+            beta = min(beta, entry.upper)
+
+        if (game_over := is_over(state)) or depth <= 0:
+            if game_over or self.evaluate is None:
+                best_value = get_payoffs(state)[Player.PLAYER1]
+            else:
+                best_value = round(self.evaluate(state) / self.step) * self.step
+            best_move = None
+            min_depth = depth if not game_over else float('inf')
+        elif plying == Player.PLAYER1:
+            best_value, best_move, min_depth = float('-inf'), None, float('inf')
+            a = alpha
+            if stats is not None:
+                stats.expanded[depth] = stats.expanded.get(depth, 0) + 1
+            for move in get_moves(state):
+                child = play(state, move)
+                value, plies = self.alphabeta(child, depth-1, a, beta)
+                if value > best_value:
+                    best_value = value
+                    best_move = move
+                min_depth = min(plies+1, min_depth)
+                if not fail_soft and best_value > beta:
+                    break
+                a = max(a, best_value)
+                if fail_soft and best_value >= beta:
+                    break
         else:
-            lowerbound = value
-    return value
-
-
-def iterative_deepening(root: State, max_depth: int = 32, fail_soft: bool = True, max_time: float = float('inf')) -> int:
-    firstguess = 0
-    starting = time.perf_counter()
-    for depth in range(2, max_depth+1, 2):
-        reset_depth_log()
-        filter_table()
-        logging.debug(f"{depth=}")
-        start = time.perf_counter()
-        value = MTDF(root, firstguess, depth, fail_soft)
-        elapsed = time.perf_counter() - start
-        logging.debug(f"{value=}\t{elapsed=:.3f}\t{lookup(root)}")
-        firstguess = value
-        if abs(value) > 0:
-            break
-        if time.perf_counter() - starting > max_time:
-            break
-    return firstguess
-
-def reset_depth_log():
-    global FIRST_ENTERED, FIRST_EXITED, EXITING
-    FIRST_ENTERED = float('-inf')
-    FIRST_EXITED = float('inf')
-    EXITING = False
+            best_value, best_move, min_depth = float('inf'), None, float('inf')
+            b = beta
+            if stats is not None:
+                stats.expanded[depth] = stats.expanded.get(depth, 0) + 1
+            for move in get_moves(state):
+                child = play(state, move)
+                value, plies = self.alphabeta(child, depth-1, alpha, b)
+                if value < best_value:
+                    best_value = value
+                    best_move = move
+                min_depth = min(plies+1, min_depth)
+                if not fail_soft and best_value < alpha:
+                    break
+                b = min(b, best_value)
+                if fail_soft and best_value <= alpha:
+                    break
+
+        if best_value <= alpha:
+            entry.upper = best_value
+        if alpha < best_value < beta:
+            entry.lower = best_value
+            entry.upper = best_value
+        if best_value >= beta:
+            entry.lower = best_value
+
+        if entry.lower > entry.upper:
+            logging.debug(f"{entry=}")
+
+        entry.best_move = best_move
+        entry.depth = min_depth
+        entry.valid = True
+
+        return best_value, min_depth
+
+    def MTDF(self, root: State, first_guess: float, depth: int) -> float:
+        value = first_guess
+        upperbound = float('inf')
+        lowerbound = float('-inf')
+        searches = 0
+        while lowerbound < upperbound:
+            beta = value + self.step if value == lowerbound else value
+            value, _ = self.alphabeta(root, depth, beta - self.step, beta)
+            searches += 1
+            if value < beta:
+                upperbound = value
+            else:
+                lowerbound = value
+        if self.stats is not None:
+            self.stats.searches.append(searches)
+        return value
+
+    def iterative_deepening(self, root: State, max_depth: int = 32, max_time: float = float('inf'),
+                            report: ReportF | None = None) -> float:
+        firstguess, best_move = 0., None
+        previous = self.deadline
+        self.deadline = min(previous, time.perf_counter() + max_time)
+        self.countdown = 0
+        try:
+            for depth in range(2, max_depth+1, 2):
+                self.filter_table()
+                start = time.perf_counter()
+                value = self.MTDF(root, firstguess, depth)
+                elapsed = time.perf_counter() - start
+                if self.stats is not None:
+                    self.stats.times[depth] = elapsed
+                logging.debug(f"{depth=}\t{value=}\t{elapsed=:.3f}")
+                firstguess, best_move = value, self.lookup(root).best_move
+                if report is not None:
+                    report(depth, value, best_move)
+                if abs(value) >= 1:
+                    break
+        except SearchInterrupted:
+            pass
+        finally:
+            self.deadline = previous
+        if best_move is None and not is_over(root):
+            best_move = get_moves(root)[0]
+        if best_move is not None:
+            self.lookup(root).best_move = best_move
+        return firstguess
+
+    def filter_table(self):
+        before = len(self.table)
+        solved = {key: entry for key, entry in self.table.items() if entry.depth == float('inf')}
+        self.table.clear()
+        self.table.update(solved)
+        after = len(self.table)
+        logging.debug(f"{before=:,}\t{after=:,}")
+
+
+SOLVER = MTDFSolver()
+
+
+def get_solver(table: Table | None = None, stats: SearchStats | None = None, fail_soft: bool = True) -> MTDFSolver:
+    if table is None and stats is None and fail_soft:
+        return SOLVER
+    return MTDFSolver(SOLVER.table if table is None else table, stats, fail_soft)
+
+
+def lookup(state: State, table: Table | None = None) -> Entry:
+    return get_solver(table).lookup(state)
+
+
+def alphabeta(state: State, depth: int, alpha: float = float('-inf'),
+            beta: float = float('inf'), fail_soft: bool = True, table: Table | None = None,
+            stats: SearchStats | None = None) -> tuple[int, int]:
+    return get_solver(table, stats, fail_soft).alphabeta(state, depth, alpha, beta)
+
+
+def MTDF(root: State, first_guess: int, depth: int, fail_soft: bool = True, stats: SearchStats | None = None) -> int:
+    return get_solver(None, stats, fail_soft).MTDF(root, first_guess, depth)
+
+
+def iterative_deepening(root: State, max_depth: int = 32, fail_soft: bool = True, max_time: float = float('inf'),
+                        stats: SearchStats | None = None) -> int:
+    return get_solver(None, stats, fail_soft).iterative_deepening(root, max_depth, max_time)
 
 
 def filter_table():
-    global TABLE
-    before = len(TABLE)
-    TABLE = {key: entry for key, entry in TABLE.items() if entry.depth == float('inf')}
-    after = len(TABLE)
-    logging.debug(f"{before=:,}\t{after=:,}")
+    SOLVER.filter_table()
 
 
 def parallel():
     state0 = State()
 
-    state1 = play(state0, f"{0:0{ATTRIBUTES}b}")
+    state1 = play(state0, 0)
 
     state11 = play(state1, (0, 0))
     state12 = play(state1, (0, 1))
@@ -203,9 +267,8 @@ def parallel():
         state11, state12, state13
     ]
 
-    global TABLE
     manager = multiprocessing.Manager()
-    TABLE = manager.dict()
+    SOLVER.table = manager.dict()
 
     with ProcessPoolExecutor() as pool:
         futures = [pool.submit(iterative_deepening, state, 2*LAST_PLY) for state in states]
@@ -213,23 +276,23 @@ def parallel():
     wait(futures)
 
     for state in states:
-        state = state_to_string(state)
-        print(state)
-        print(TABLE[state])
+        print(state_to_string(state))
+        print(SOLVER.table[pack(state)])
 
 
 def main():
     logging.basicConfig(level=logging.DEBUG)
     logging.root.level = logging.DEBUG
     start = time.perf_counter()
-    alphabeta(State(), 2*LAST_PLY, -.5, .5)
+    stats = SearchStats()
+    alphabeta(State(), 2*LAST_PLY, -.5, .5, stats=stats)
     # MTDF(State(), 1, 2*LAST_PLY)
     # iterative_deepening(State(), 2*LAST_PLY)
     elapsed = time.perf_counter() - start
-    logging.info(f"{ITERS=:,d}\t{elapsed=:.3f} s")
+    logging.info(f"{stats!s}\t{elapsed=:.3f} s")
     entry = lookup(State())
     logging.info(f"{entry=}")
-    n_entries = len(TABLE)
+    n_entries = len(SOLVER.table)
     logging.info(f"{n_entries=}")
 
 
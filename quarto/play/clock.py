@@ -0,0 +1,41 @@
+from dataclasses import dataclass, field
+import math
+
+from quarto.representation.logic import LAST_PLY, PIECE, State, get_phase, get_ply
+from quarto.representation.phase import Phase
+from quarto.representation.symmetry import get_unique_moves
+
+
+@dataclass(slots=True)
+class TimeManager:
+    total: float
+    increment: float = 0.
+    peak: float = 7.
+    width: float = 4.
+    floor: float = .1
+    reserve: float = .05
+    min_time: float = .005
+    remaining: float = field(init=False, default=0.)
+
+    def __post_init__(self):
+        self.reset()
+
+    def reset(self):
+        self.remaining = self.total
+
+    def weight(self, placed: int) -> float:
+        return self.floor + math.exp(-((placed - self.peak) / self.width)**2)
+
+    def allocate(self, state: State) -> float:
+        placed = len(state) - (PIECE in state)
+        if placed == 0:
+            self.reset()
+        if get_phase(state) == Phase.PUT or get_ply(state) == 0:
+            self.remaining += self.increment
+        if len(get_unique_moves(state)) == 1:
+            return self.min_time
+        share = self.weight(placed) / sum(self.weight(future) for future in range(placed, LAST_PLY))
+        return max(self.min_time, self.remaining * (1 - self.reserve) * share)
+
+    def spend(self, elapsed: float):
+        self.remaining -= elapsed
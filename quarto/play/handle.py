@@ -0,0 +1,107 @@
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
+from typing import Callable, Generator
+import asyncio
+import threading
+
+from quarto.mcts.node import Node, get_best_move, get_root, get_value
+from quarto.mcts.search import MCTS
+from quarto.mcts.stoppers import Asynchronous, FirstOf
+from quarto.mtdf.mtdf import MTDFSolver
+from quarto.representation.logic import State
+from quarto.representation.move import Move
+from quarto.representation.player import Player
+
+
+@dataclass(slots=True, frozen=True)
+class Analysis:
+    best_move: Move | None = None
+    value: float | None = None
+    iterations: int = 0
+    depth: int = 0
+    done: bool = False
+
+
+@dataclass(slots=True)
+class SearchHandle:
+    target: "Callable[[SearchHandle], None]"
+    stopped: threading.Event = field(default_factory=threading.Event)
+    analysis: Analysis = field(default_factory=Analysis)
+    future: "Future[Analysis]" = field(default_factory=Future)
+
+    def start(self) -> "SearchHandle":
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _run(self):
+        try:
+            self.target(self)
+        except BaseException as exception:
+            self.future.set_exception(exception)
+        else:
+            self.analysis = replace(self.analysis, done=True)
+            self.future.set_result(self.analysis)
+
+    def report(self, best_move: Move | None, value: float | None, iterations: int = 0, depth: int = 0):
+        self.analysis = Analysis(best_move, value, iterations, depth)
+
+    @property
+    def best_move(self) -> Move | None:
+        return self.analysis.best_move
+
+    def cancel(self):
+        self.stopped.set()
+
+    def result(self, timeout: float | None = None) -> Analysis:
+        return self.future.result(timeout)
+
+    def stop(self, timeout: float | None = None) -> Analysis:
+        self.cancel()
+        return self.result(timeout)
+
+    def __await__(self) -> Generator[object, None, Analysis]:
+        return asyncio.wrap_future(self.future).__await__()
+
+
+@dataclass(slots=True)
+class Reporter:
+    handle: SearchHandle
+    root: Node
+    every: int = 64
+    last: int = field(init=False, default=0)
+
+    def __call__(self, iteration: int, root: Node) -> bool:
+        if iteration - self.last >= self.every and self.root.children:
+            self.last = iteration
+            self.publish()
+        return False
+
+    def publish(self):
+        root = self.root
+        if not root.children:
+            return
+        best_move = get_best_move(root)
+        self.handle.report(best_move, get_value(root.children[best_move], Player.PLAYER1), root.visits)
+
+
+def search_mcts(mcts: MCTS, state: State, root: Node | None = None, every: int = 64) -> SearchHandle:
+    root = get_root(state, mcts.zero_sum) if root is None else root
+
+    def target(handle: SearchHandle):
+        reporter = Reporter(handle, root, every)
+        stop = FirstOf([reporter, Asynchronous(handle.stopped), mcts.stop])
+        replace(mcts, stop=stop).search(state, root)
+        reporter.publish()
+
+    return SearchHandle(target).start()
+
+
+def search_mtdf(solver: MTDFSolver, state: State, max_depth: int = 32,
+                max_time: float = float('inf')) -> SearchHandle:
+
+    def target(handle: SearchHandle):
+        interruptible = replace(solver, stop=handle.stopped)
+        interruptible.iterative_deepening(state, max_depth, max_time,
+                                          lambda depth, value, move: handle.report(move, value, depth=depth))
+
+    return SearchHandle(target).start()
@@ -1,10 +1,9 @@
-from functools import cache
-from itertools import pairwise
-from operator import itemgetter
+from functools import cache, reduce
+from operator import and_, invert
 
-from quarto.representation.constants import SIDE, ATTRIBUTES
+from quarto.representation.constants import SIDE
 from quarto.representation.payoffs import Payoffs
-from quarto.representation.piece import Piece, NULL_PIECE, PIECES
+from quarto.representation.piece import Piece, NULL_PIECE, PIECE_MASK, PIECES, piece_to_string
 from quarto.representation.square import Square, NULL_SQUARE, SQUARES, ROWS, COLS, DIAG, ADIAG
 from quarto.representation.phase import Phase
 from quarto.representation.player import Player, get_plying
@@ -14,11 +13,17 @@ from quarto.representation.move import Move
 State = dict[Square, Piece]
 PIECE = NULL_SQUARE
 LAST_PLY = len(PIECES)
+LINE_SQUARES = tuple(tuple(sorted(line)) for line in (*ROWS.values(), *COLS.values(), DIAG, ADIAG))
+OpenLine = tuple[Square, Piece, Piece]
 
 
 get_ply = len
 
 
+def count_free(state: State) -> int:
+    return len(SQUARES) - len(state) + (PIECE in state)
+
+
 def get_phase(state: State) -> Phase:
     if PIECE not in state:
         return Phase.GIVE
@@ -47,6 +52,20 @@ def get_moves(state: State) -> tuple[Piece, ...] | tuple[Square, ...]:
     return get_free(frozenset(state.keys()))
 
 
+def get_path(state0: State, state1: State) -> list[Move] | None:
+    moves, hand = [], state0.get(PIECE)
+    for square, piece in state1.items():
+        if square == PIECE or square in state0:
+            continue
+        if hand is None:
+            moves.append(piece)
+        moves.append(square)
+        hand = None
+    if hand is None and PIECE in state1:
+        moves.append(state1[PIECE])
+    return moves if reduce(play, moves, state0) == state1 else None
+
+
 @cache
 def get_available(used: frozenset[Piece]) -> tuple[Piece, ...]:
     return tuple(sorted(PIECES.difference(used)))
@@ -76,12 +95,29 @@ def get_winner(state: State) -> Player | None:
 def is_quarto(pieces: frozenset[Piece]) -> bool:
     if len(pieces) < SIDE:
         return False
-    return any(
-        all(piece[i] == other[i] for piece, other in pairwise(pieces))
-        for i in range(ATTRIBUTES)
-    )
+    return bool(reduce(and_, pieces) or reduce(and_, map(invert, pieces)) & PIECE_MASK)
     
 
+def get_open_lines(state: State) -> list[OpenLine]:
+    open_lines = []
+    for line in LINE_SQUARES:
+        empty, count, and_mask, nor_mask = None, 0, PIECE_MASK, PIECE_MASK
+        for square in line:
+            if (piece := state.get(square)) is None:
+                empty = square
+                continue
+            and_mask &= piece
+            nor_mask &= ~piece
+            count += 1
+        if count == SIDE - 1 and (and_mask or nor_mask):
+            open_lines.append((empty, and_mask, nor_mask))
+    return open_lines
+
+
+def completes(piece: Piece, and_mask: Piece, nor_mask: Piece) -> bool:
+    return bool(piece & and_mask or ~piece & nor_mask)
+
+
 def is_over(state: State) -> bool:
     if get_ply(state) == LAST_PLY and get_phase(state) == Phase.GIVE:
         return True
@@ -98,9 +134,16 @@ def get_payoffs(state: State) -> Payoffs:
     return {Player.PLAYER1: 0, Player.PLAYER2: 0}
 
 
+def get_payoff(state: State) -> int:
+    winner = get_winner(state)
+    if winner is None:
+        return 0
+    return 1 if winner == Player.PLAYER1 else -1
+
+
 def board_to_string(state: State) -> str:
     return '\n'.join(
-        ' '.join(state.get((i, j), NULL_PIECE) for j in range(SIDE))
+        ' '.join(piece_to_string(state.get((i, j), NULL_PIECE)) for j in range(SIDE))
         for i in range(SIDE)
     )
 
@@ -111,7 +154,7 @@ def state_to_string(state: State) -> str:
     phase = 'PUT' if phase == Phase.PUT else 'GIVE'
     plying = get_plying(ply)
     plying = 'PLAYER1' if plying == Player.PLAYER1 else 'PLAYER2'
-    piece = state.get(PIECE, NULL_PIECE)
+    piece = piece_to_string(state.get(PIECE, NULL_PIECE))
     return (f"{plying=}\n"
             f"{ply=:>2d}\t{phase=}\n"
             f"{board_to_string(state)}\n"
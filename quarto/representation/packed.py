@@ -0,0 +1,59 @@
+from quarto.representation.constants import ATTRIBUTES, SIDE
+from quarto.representation.logic import PIECE, State, is_quarto, get_pieces
+from quarto.representation.piece import PIECE_MASK, Piece
+from quarto.representation.square import SQUARES, Square, ROWS, COLS, DIAG, ADIAG
+
+
+Packed = int
+
+N_SQUARES = SIDE * SIDE
+OCCUPIED_SHIFT = N_SQUARES * ATTRIBUTES
+HAND_SHIFT = OCCUPIED_SHIFT + N_SQUARES
+HAND_FLAG = 1 << (HAND_SHIFT + ATTRIBUTES)
+OCCUPIED_MASK = (1 << N_SQUARES) - 1
+
+SORTED_SQUARES = tuple(sorted(SQUARES))
+SQUARE_INDICES = {square: index for index, square in enumerate(SORTED_SQUARES)}
+LINES = (*ROWS.values(), *COLS.values(), DIAG, ADIAG)
+
+
+def pack(state: State) -> Packed:
+    packed = 0
+    for square, piece in state.items():
+        if square == PIECE:
+            packed |= HAND_FLAG | piece << HAND_SHIFT
+            continue
+        index = SQUARE_INDICES[square]
+        packed |= piece << (index * ATTRIBUTES) | 1 << (OCCUPIED_SHIFT + index)
+    return packed
+
+
+def unpack(packed: Packed) -> State:
+    occupied = packed >> OCCUPIED_SHIFT & OCCUPIED_MASK
+    state = State()
+    for index, square in enumerate(SORTED_SQUARES):
+        if occupied >> index & 1:
+            state[square] = packed >> (index * ATTRIBUTES) & PIECE_MASK
+    if (last := get_last_square(state)) is not None:
+        state[last] = state.pop(last)
+    if packed & HAND_FLAG:
+        state[PIECE] = get_hand(packed)
+    return state
+
+
+def get_hand(packed: Packed) -> Piece | None:
+    if not packed & HAND_FLAG:
+        return None
+    return packed >> HAND_SHIFT & PIECE_MASK
+
+
+def get_occupied(packed: Packed) -> int:
+    return packed >> OCCUPIED_SHIFT & OCCUPIED_MASK
+
+
+def get_last_square(state: State) -> Square | None:
+    # get_winner() only inspects the last placed square, so a completed line must end the dict
+    for line in LINES:
+        if line.issubset(state.keys()) and is_quarto(get_pieces(state, line)):
+            return min(line)
+    return None
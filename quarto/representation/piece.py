@@ -1,5 +1,12 @@
-from quarto.representation.constants import ATTRIBUTES, SIDE
+from quarto.representation.constants import ATTRIBUTES
 
-Piece = str
-NULL_PIECE = '-' * ATTRIBUTES
-PIECES = frozenset(f"{piece:0{ATTRIBUTES}b}" for piece in range(2**ATTRIBUTES))
+Piece = int
+NULL_PIECE = -1
+PIECE_MASK = 2**ATTRIBUTES - 1
+PIECES = frozenset(range(2**ATTRIBUTES))
+
+
+def piece_to_string(piece: Piece) -> str:
+    if piece == NULL_PIECE:
+        return '-' * ATTRIBUTES
+    return f"{piece:0{ATTRIBUTES}b}"
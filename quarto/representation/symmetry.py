@@ -0,0 +1,148 @@
+from functools import lru_cache
+from itertools import permutations, product
+
+from quarto.representation.constants import ATTRIBUTES, SIDE
+from quarto.representation.logic import PIECE, State, get_moves, get_phase
+from quarto.representation.move import Move
+from quarto.representation.packed import N_SQUARES, SORTED_SQUARES, SQUARE_INDICES, Packed, pack, unpack
+from quarto.representation.phase import Phase
+from quarto.representation.piece import PIECES, Piece
+from quarto.representation.square import SQUARES, Square
+
+
+SquareTransform = dict[Square, Square]
+PieceMapping = tuple[Piece, ...]
+Symmetry = tuple[int, int]
+
+
+def rotate(square: Square) -> Square:
+    i, j = square
+    return j, SIDE-1-i
+
+
+def flip(square: Square) -> Square:
+    i, j = square
+    return i, SIDE-1-j
+
+
+def get_square_transform(rotations: int, flipping: bool) -> SquareTransform:
+    transform = {}
+    for square in SQUARES:
+        mapped = flip(square) if flipping else square
+        for _ in range(rotations):
+            mapped = rotate(mapped)
+        transform[square] = mapped
+    return transform
+
+
+def get_piece_mapping(permutation: tuple[int, ...], flipping: Piece) -> PieceMapping:
+    return tuple(
+        sum(((piece ^ flipping) >> (ATTRIBUTES-1-i) & 1) << (ATTRIBUTES-1-k) for k, i in enumerate(permutation))
+        for piece in sorted(PIECES)
+    )
+
+
+SQUARE_TRANSFORMS = tuple(get_square_transform(rotations, flipping)
+                          for flipping, rotations in product([False, True], range(4)))
+PIECE_MAPPINGS = tuple(get_piece_mapping(permutation, flipping)
+                       for permutation, flipping in product(permutations(range(ATTRIBUTES)), sorted(PIECES)))
+ALL_MAPPINGS = (1 << len(PIECE_MAPPINGS)) - 1
+SORTED_PIECES = tuple(sorted(PIECES))
+IDENTITY: Symmetry = 0, 0
+MAPPINGS_BY_PAIR = {
+    (piece, other): sum(1 << k for k, mapping in enumerate(PIECE_MAPPINGS) if mapping[piece] == other)
+    for piece, other in product(PIECES, repeat=2)
+}
+LOWERING_MAPPINGS = {
+    piece: sum(MAPPINGS_BY_PAIR[piece, other] for other in PIECES if other < piece)
+    for piece in PIECES
+}
+
+INVERSE_TRANSFORMS = tuple(
+    next(k for k, other in enumerate(SQUARE_TRANSFORMS) if all(other[transform[square]] == square for square in SQUARES))
+    for transform in SQUARE_TRANSFORMS
+)
+INVERSE_MAPPINGS = tuple(
+    PIECE_MAPPINGS.index(tuple(sorted(PIECES, key=mapping.__getitem__)))
+    for mapping in PIECE_MAPPINGS
+)
+
+
+@lru_cache(maxsize=2**17)
+def get_invariant_transforms(occupied: frozenset[Square]) -> tuple[SquareTransform, ...]:
+    squares = occupied.difference({PIECE})
+    return tuple(transform for transform in SQUARE_TRANSFORMS
+                 if all(transform[square] in squares for square in squares))
+
+
+def get_stabilizer(state: State) -> tuple[tuple[SquareTransform, int], ...]:
+    stabilizer = []
+    hand = state.get(PIECE)
+    for transform in get_invariant_transforms(frozenset(state.keys())):
+        mappings = ALL_MAPPINGS if hand is None else MAPPINGS_BY_PAIR[hand, hand]
+        for square, piece in state.items():
+            if square == PIECE:
+                continue
+            if not (mappings := mappings & MAPPINGS_BY_PAIR[piece, state[transform[square]]]):
+                break
+        else:
+            stabilizer.append((transform, mappings))
+    return tuple(stabilizer)
+
+
+def get_unique_moves(state: State) -> tuple[Piece, ...] | tuple[Square, ...]:
+    moves = get_moves(state)
+    stabilizer = get_stabilizer(state)
+    if len(stabilizer) == 1 and stabilizer[0][1] == 1:
+        return moves
+    if get_phase(state) == Phase.GIVE:
+        union = 0
+        for _, mappings in stabilizer:
+            union |= mappings
+        return tuple(piece for piece in moves if not union & LOWERING_MAPPINGS[piece])  # type: ignore
+    transforms = [transform for transform, _ in stabilizer]
+    return tuple(square for square in moves if all(transform[square] >= square for transform in transforms))  # type: ignore
+
+
+def apply_symmetry(state: State, symmetry: Symmetry) -> State:
+    transform, mapping = SQUARE_TRANSFORMS[symmetry[0]], PIECE_MAPPINGS[symmetry[1]]
+    return {square if square == PIECE else transform[square]: mapping[piece] for square, piece in state.items()}
+
+
+def map_move(move: Move, symmetry: Symmetry) -> Move:
+    if isinstance(move, tuple):
+        return SQUARE_TRANSFORMS[symmetry[0]][move]
+    return PIECE_MAPPINGS[symmetry[1]][move]
+
+
+def get_inverse(symmetry: Symmetry) -> Symmetry:
+    return INVERSE_TRANSFORMS[symmetry[0]], INVERSE_MAPPINGS[symmetry[1]]
+
+
+def get_canonical(state: State) -> tuple[Packed, Symmetry]:
+    return _get_canonical(pack(state))
+
+
+@lru_cache(maxsize=2**16)
+def _get_canonical(packed: Packed) -> tuple[Packed, Symmetry]:
+    state = unpack(packed)
+    hand = state.get(PIECE)
+    base = ALL_MAPPINGS if hand is None else MAPPINGS_BY_PAIR[hand, 0]
+    best, symmetry = None, IDENTITY
+    for k, transform in enumerate(SQUARE_TRANSFORMS):
+        board = {transform[square]: piece for square, piece in state.items() if square != PIECE}
+        occupancy = sum(1 << SQUARE_INDICES[square] for square in board)
+        if best is not None and occupancy > best[0]:
+            continue
+        candidates, pieces = base, 0
+        for index in reversed(range(N_SQUARES)):
+            if (piece := board.get(SORTED_SQUARES[index])) is None:
+                continue
+            for other in SORTED_PIECES:
+                if restricted := candidates & MAPPINGS_BY_PAIR[piece, other]:
+                    candidates = restricted
+                    pieces |= other << (index * ATTRIBUTES)
+                    break
+        if best is None or (occupancy, pieces) < best:
+            best, symmetry = (occupancy, pieces), (k, (candidates & -candidates).bit_length() - 1)
+    return pack(apply_symmetry(state, symmetry)), symmetry
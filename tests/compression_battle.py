@@ -4,36 +4,28 @@ import logging
 from pprint import pprint
 import time
 from quarto.representation.player import Player, get_plying
-from quarto.solver.cumdict import cumdict
-from quarto.solver.node import Node
-from quarto.solver.search import MCTS
-from quarto.solver.expand import Expand
-from quarto.solver.simulate import Simulator
-
-from quarto.compression.pieces import get_available as get_unique_available
-from quarto.compression.squares import get_free as get_unique_free
+from quarto.mcts.cumdict import cumdict
+from quarto.mcts.node import Node
+from quarto.mcts.search import MCTS
+from quarto.mcts.expand import Expand
+from quarto.mcts.simulate import Simulator
 
 from quarto.representation.logic import (State, Move, get_available, get_free, get_payoffs, get_phase,
                                          Phase, get_winner, is_over, get_ply, play, state_to_string)
-from quarto.solver.stoppers import MaxIters
+from quarto.representation.symmetry import get_unique_moves
+from quarto.mcts.stoppers import MaxIters
 
 
-def get_unique_square_moves(state: State) -> frozenset[Move]:
+def get_unique_square_moves(state: State) -> tuple[Move, ...]:
     if get_phase(state) == Phase.PUT:
-        return get_unique_free(frozenset(state.keys()))
+        return get_unique_moves(state)
     return get_available(frozenset(state.values()))
 
 
-def get_unique_pieces_moves(state: State) -> frozenset[Move]:
+def get_unique_pieces_moves(state: State) -> tuple[Move, ...]:
     if get_phase(state) == Phase.PUT:
         return get_free(frozenset(state.keys()))
-    return get_unique_available(frozenset(state.values()))
-
-
-def get_unique_moves(state: State) -> frozenset[Move]:
-    if get_phase(state) == Phase.PUT:
-        return get_unique_free(frozenset(state.keys()))
-    return get_unique_available(frozenset(state.values()))
+    return get_unique_moves(state)
 
 
 def get_move(node: Node) -> Move:
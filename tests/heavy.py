@@ -0,0 +1,51 @@
+import logging
+import random
+
+from tqdm import tqdm
+
+from quarto.mcts.policies import HeavyPolicy
+from quarto.representation.logic import State, get_moves, get_phase, get_ply, get_winner, is_over, play
+from quarto.representation.move import Move
+from quarto.representation.phase import Phase
+from quarto.representation.player import get_plying
+
+
+def is_winning_put(state: State, square: Move) -> bool:
+    return get_winner(play(state, square)) == get_plying(get_ply(state))
+
+
+def is_safe_give(state: State, piece: Move) -> bool:
+    child = play(state, piece)
+    return not any(is_winning_put(child, square) for square in get_moves(child))
+
+
+def check_policy(n_games: int = 3_000):
+    policy = HeavyPolicy(epsilon=0.)
+    wins, safe_gives, forced = 0, 0, 0
+    for _ in tqdm(range(n_games), desc=f"HEAVY POLICY VS BRUTE FORCE: {n_games=:,}"):
+        state = State()
+        while not is_over(state):
+            moves = get_moves(state)
+            move = policy(state, moves)
+            assert move in moves, (state, move)
+            if get_phase(state) == Phase.PUT:
+                if any(is_winning_put(state, square) for square in moves):
+                    assert is_winning_put(state, move), (state, move)
+                    wins += 1
+            elif any(is_safe_give(state, piece) for piece in moves):
+                assert is_safe_give(state, move), (state, move)
+                safe_gives += 1
+            else:
+                forced += 1
+            state = play(state, random.choice(moves))
+    logging.info(f"{n_games=:,}\t{wins=:,}\t{safe_gives=:,}\t{forced=:,}\tok")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    random.seed(0)
+    check_policy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import logging
+import random
+
+from tqdm import tqdm
+
+from quarto.representation.logic import State, get_moves, get_winner, is_over, play
+from quarto.representation.packed import pack, unpack
+
+
+def random_states(n_games: int):
+    for _ in range(n_games):
+        state = State()
+        yield state
+        while not is_over(state):
+            state = play(state, random.choice(get_moves(state)))
+            yield state
+
+
+def check_round_trip(n_games: int = 2_000):
+    n_states = 0
+    for state in tqdm(random_states(n_games), desc=f"PACKED ROUND TRIP: {n_games=:,}"):
+        packed = pack(state)
+        unpacked = unpack(packed)
+        assert unpacked == state, (state, unpacked)
+        assert pack(unpacked) == packed, (state, unpacked)
+        assert get_winner(unpacked) == get_winner(state), (state, unpacked)
+        n_states += 1
+    logging.info(f"{n_states=:,}\tok")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    random.seed(0)
+    check_round_trip()
+
+
+if __name__ == "__main__":
+    main()
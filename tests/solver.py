@@ -0,0 +1,73 @@
+import logging
+import random
+
+from tqdm import tqdm
+
+from quarto.bench.positions import POSITIONS
+from quarto.mcts.node import Node, get_best_move, solve_propagate
+from quarto.mcts.search import MCTS
+from quarto.mcts.select import SolverSelect
+from quarto.mcts.stoppers import MaxIters
+from quarto.mtdf.mtdf import MTDFSolver
+from quarto.representation.logic import LAST_PLY, PIECE, State, count_free, get_moves, is_over, play
+from quarto.representation.player import Player
+
+
+def random_state(max_free: int) -> State:
+    state = State()
+    while not is_over(state) and (PIECE not in state or count_free(state) > max_free):
+        state = play(state, random.choice(get_moves(state)))
+    return state
+
+
+def check_tree(root: Node, solver: MTDFSolver) -> int:
+    n_proven, stack = 0, [root]
+    while stack:
+        node = stack.pop()
+        stack.extend(node.children.values())
+        if node.proven is None:
+            continue
+        value, _ = solver.alphabeta(node.state, 2*LAST_PLY)
+        assert node.proven[Player.PLAYER1] == value, (node.state, node.proven, value)
+        if node.children:
+            child = node.children[get_best_move(node)]
+            assert child.proven is not None and child.proven[Player.PLAYER1] == value, (node.state, child.proven)
+        n_proven += 1
+    return n_proven
+
+
+def check_random(n_positions: int = 40, max_free: int = 7, max_iterations: int = 20_000):
+    solver, solved, n_proven = MTDFSolver(), 0, 0
+    mcts = MCTS(MaxIters(max_iterations), SolverSelect(), back_propagate=solve_propagate)
+    for _ in tqdm(range(n_positions), desc=f"SOLVER VS ALPHABETA: {n_positions=:,}, {max_free=}"):
+        if is_over(state := random_state(max_free)):
+            continue
+        root = mcts.search(state)
+        solved += root.proven is not None
+        n_proven += check_tree(root, solver)
+    logging.info(f"{n_positions=}\t{solved=}\t{n_proven=:,}\tok")
+
+
+def check_corpus(max_iterations: int = 20_000):
+    solver = MTDFSolver()
+    mcts = MCTS(MaxIters(max_iterations), SolverSelect(), back_propagate=solve_propagate)
+    for position in POSITIONS.values():
+        if position.stage != "endgame":
+            continue
+        root = mcts.search(position.state)
+        assert root.proven is not None, position.name
+        assert root.proven[Player.PLAYER1] == position.value, position.name
+        assert get_best_move(root) in position.best_moves, position.name
+        n_proven = check_tree(root, solver)
+        logging.info(f"{position.name}\t{n_proven=:,}\tok")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    random.seed(0)
+    check_corpus()
+    check_random()
+
+
+if __name__ == "__main__":
+    main()
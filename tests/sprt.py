@@ -0,0 +1,60 @@
+import logging
+import random
+
+from tqdm import tqdm
+
+from quarto.arena.sprt import SPRT, get_score
+from quarto.arena.tournament import Summary
+
+
+def play_match(sprt: SPRT, elo: float, draw_rate: float = .3, max_games: int = 20_000) -> tuple[Summary, bool | None]:
+    summary = Summary("a", "b")
+    score = get_score(elo)
+    win_rate = score - draw_rate / 2
+    for _ in range(max_games):
+        outcome = random.random()
+        if outcome < win_rate:
+            summary.wins += 1
+        elif outcome < win_rate + draw_rate:
+            summary.draws += 1
+        else:
+            summary.losses += 1
+        if (verdict := sprt(summary)) is not None:
+            return summary, verdict
+    return summary, None
+
+
+def check_sweeps(sprt: SPRT = SPRT()):
+    n = sprt.min_games
+    assert sprt(Summary("a", "b", wins=n)) is True
+    assert sprt(Summary("a", "b", losses=n)) is False
+    assert sprt(Summary("a", "b", draws=n)) is None
+    games = next(games for games in range(n, 10_000) if sprt(Summary("a", "b", draws=games)) is not None)
+    assert sprt(Summary("a", "b", draws=games)) is False
+    assert sprt.llr(Summary("a", "b")) == 0.
+    logging.info(f"sweeps ok\tdraws decided after {games=:,}")
+
+
+def check_error_rates(sprt: SPRT = SPRT(elo0=0., elo1=20.), n_matches: int = 200):
+    for elo, expected, rate in [(sprt.elo0, False, sprt.alpha), (sprt.elo1, True, sprt.beta)]:
+        errors, undecided, games = 0, 0, 0
+        for _ in tqdm(range(n_matches), desc=f"SPRT: {elo=}"):
+            summary, verdict = play_match(sprt, elo)
+            games += summary.games
+            undecided += verdict is None
+            errors += verdict is not None and verdict != expected
+        logging.info(f"{elo=}\terrors={errors / n_matches:.3f} (nominal {rate})\t{undecided=}\t"
+                     f"games={games / n_matches:,.0f}")
+        assert undecided == 0
+        assert errors / n_matches < 2 * rate + .02
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    random.seed(0)
+    check_sweeps()
+    check_error_rates()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import logging
+import os
+import random
+import tempfile
+
+from quarto.mcts.node import Node, solve_propagate, zero_sum_propagate
+from quarto.mcts.search import MCTS
+from quarto.mcts.select import Select, SolverSelect
+from quarto.mcts.measures import ZeroSumUCT
+from quarto.mcts.simulate import Simulator
+from quarto.mcts.storage import from_bytes, load, save, to_bytes
+from quarto.mcts.stoppers import MaxIters
+from quarto.representation.logic import State, get_moves, get_payoff, play
+from quarto.representation.player import Player
+
+
+def get_value(node: Node) -> float:
+    return node.value if node.payoffs is None else node.payoffs[Player.PLAYER1]
+
+
+def assert_equal(node: Node, other: Node):
+    stack = [(node, other)]
+    while stack:
+        node, other = stack.pop()
+        assert node.move == other.move, (node.move, other.move)
+        assert node.visits == other.visits, node.move
+        assert get_value(node) == get_value(other), node.move
+        assert node.squares == other.squares, node.move
+        assert node.fully_expanded == other.fully_expanded, node.move
+        assert node.proven == other.proven, node.move
+        assert list(node.children) == list(other.children), node.move
+        stack.extend(zip(node.children.values(), other.children.values()))
+
+
+def get_searches() -> dict[str, MCTS]:
+    return {
+        'default': MCTS(MaxIters(2_000)),
+        'solver': MCTS(MaxIters(2_000), SolverSelect(), back_propagate=solve_propagate),
+        'zero_sum': MCTS(MaxIters(2_000), Select(ZeroSumUCT()), simulate=Simulator(get_payoffs=get_payoff),  # type: ignore
+                         back_propagate=zero_sum_propagate, zero_sum=True),  # type: ignore
+    }
+
+
+def check_round_trip(n_positions: int = 5):
+    for name, mcts in get_searches().items():
+        for _ in range(n_positions):
+            state = State()
+            for _ in range(random.randint(0, 10)):
+                state = play(state, random.choice(get_moves(state)))
+            root = mcts.search(state)
+            data = to_bytes(root)
+            assert_equal(root, from_bytes(data))
+            assert_equal(root, from_bytes(data, lean=True))
+            loaded = from_bytes(data)
+            mcts.search(state, loaded)
+            assert loaded.visits > root.visits or loaded.proven is not None
+        logging.info(f"{name}\t{n_positions=}\tok")
+
+
+def check_file():
+    root = MCTS(MaxIters(1_000)).search(State())
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tree.bin")
+        save(root, path)
+        assert_equal(root, load(path))
+    logging.info("file\tok")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    random.seed(0)
+    check_round_trip()
+    check_file()
+
+
+if __name__ == "__main__":
+    main()
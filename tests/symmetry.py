@@ -0,0 +1,62 @@
+from itertools import product
+import logging
+import random
+
+from tqdm import tqdm
+
+from quarto.representation.logic import State, get_moves, is_over, play
+from quarto.representation.packed import Packed, pack
+from quarto.representation.symmetry import (PIECE_MAPPINGS, SQUARE_TRANSFORMS, Symmetry, apply_symmetry,
+                                            get_canonical, get_unique_moves, map_move)
+
+
+SYMMETRIES = tuple(product(range(len(SQUARE_TRANSFORMS)), range(len(PIECE_MAPPINGS))))
+
+
+def brute_canonical(state: State) -> Packed:
+    return min(pack(apply_symmetry(state, symmetry)) for symmetry in SYMMETRIES)
+
+
+def brute_stabilizer(state: State) -> list[Symmetry]:
+    return [symmetry for symmetry in SYMMETRIES if apply_symmetry(state, symmetry) == state]
+
+
+def random_state(max_moves: int) -> State:
+    state = State()
+    for _ in range(random.randint(0, max_moves)):
+        if is_over(state):
+            break
+        state = play(state, random.choice(get_moves(state)))
+    return state
+
+
+def check_canonical(n_states: int = 500, max_moves: int = 12):
+    for _ in tqdm(range(n_states), desc=f"CANONICAL VS BRUTE FORCE: {n_states=:,}"):
+        state = random_state(max_moves)
+        canonical, symmetry = get_canonical(state)
+        assert canonical == brute_canonical(state), state
+        assert pack(apply_symmetry(state, symmetry)) == canonical, state
+    logging.info(f"{n_states=:,}\tok")
+
+
+def check_unique_moves(n_states: int = 200, max_moves: int = 8):
+    for _ in tqdm(range(n_states), desc=f"UNIQUE MOVES VS BRUTE FORCE: {n_states=:,}"):
+        state = random_state(max_moves)
+        if is_over(state):
+            continue
+        stabilizer = brute_stabilizer(state)
+        orbits = {frozenset(map_move(move, symmetry) for symmetry in stabilizer) for move in get_moves(state)}
+        unique = get_unique_moves(state)
+        assert sorted(len(orbit.intersection(unique)) for orbit in orbits) == [1] * len(orbits), state
+    logging.info(f"{n_states=:,}\tok")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    random.seed(0)
+    check_canonical()
+    check_unique_moves()
+
+
+if __name__ == "__main__":
+    main()